@@ -0,0 +1,197 @@
+# frame_clock.py
+import math
+import time
+import weakref
+
+_clocks = weakref.WeakKeyDictionary()  # Tk root -> FrameClock
+
+
+class FrameTask:
+    """One registered callback. Change `interval_ms` from inside the callback to vary
+    the time until its next frame (e.g. per-frame GIF delays); cancel() to stop it."""
+
+    def __init__(self, clock, callback, interval_ms, repeat, widget, name):
+        self.clock = clock
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.repeat = repeat
+        self.widget = widget
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+        self.due = None
+        self.active = True
+
+    def cancel(self):
+        if self.active:
+            self.active = False
+            self.clock.tasks.remove(self)
+
+
+class FrameClock:
+    """Shared animation scheduler for one Tk root.
+
+    Instead of every page keeping its own `after` chain, animations register here
+    and all updates that are due run together in a single `after` callback per
+    frame, with nothing scheduled at all while nothing is due.
+
+    Repeating tasks get the number of intervals that have passed since their last
+    call (`steps`), so when the app falls behind they jump ahead instead of
+    replaying every missed frame. Frames whose work takes longer than `budget_ms`
+    are counted and reported (at most every `report_every` seconds), naming the
+    slowest callback.
+    """
+
+    def __init__(self, root, fps=60, budget_ms=None, report_every=5.0, clock=time.monotonic):
+        self.root = root
+        self.clock = clock
+        self.frame_ms = 1000 / fps
+        self.budget_ms = budget_ms or self.frame_ms
+        self.report_every = report_every
+        self.tasks = []
+        self.after_id = None
+        self.armed_for = None
+
+        self.frames = 0
+        self.dropped = 0
+        self.overruns = 0
+        self.worst_ms = 0.0
+        self._last_report = clock()
+        self._unreported = 0
+
+    # ---- registering ----
+
+    def every(self, interval_ms, callback, widget=None, name=None, start_now=True):
+        """Call callback(steps) every `interval_ms` until cancelled (or `widget` is destroyed)."""
+        task = FrameTask(self, callback, interval_ms, True, widget, name)
+        self._add(task, 0 if start_now else interval_ms)
+        return task
+
+    def after(self, delay_ms, callback, widget=None, name=None):
+        """Call callback() once, in the first frame at least `delay_ms` from now."""
+        task = FrameTask(self, callback, delay_ms, False, widget, name)
+        self._add(task, delay_ms)
+        return task
+
+    def _add(self, task, delay_ms):
+        task.due = self.clock() + delay_ms / 1000
+        self.tasks.append(task)
+        self._arm()
+
+    # ---- the frame loop ----
+
+    def _arm(self):
+        """Make sure one Tk callback is pending for the earliest due task."""
+        if not self.tasks:
+            if self.after_id is not None:
+                self.root.after_cancel(self.after_id)
+                self.after_id = self.armed_for = None
+            return
+        due = min(task.due for task in self.tasks)
+        if self.after_id is not None and self.armed_for <= due:
+            return
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        delay = max(0, math.ceil((due - self.clock()) * 1000))
+        self.armed_for = due
+        self.after_id = self.root.after(delay, self._frame)
+
+    def _frame(self):
+        self.after_id = self.armed_for = None
+        start = time.perf_counter()
+        now = self.clock()
+        # Animations due within half a frame run now, so nearby updates share one redraw.
+        # One-shot callbacks (e.g. the timer tick) never run early.
+        cutoff = now + self.frame_ms / 2000
+        slowest, slowest_ms = None, 0.0
+
+        for task in [t for t in self.tasks if t.due <= (cutoff if t.repeat else now)]:
+            if not task.active:
+                continue  # cancelled by an earlier callback in this frame
+            if task.widget is not None and not task.widget.winfo_exists():
+                task.cancel()
+                continue
+            t0 = time.perf_counter()
+            if task.repeat:
+                late = max(0.0, now - task.due)
+                steps = 1 + int(late * 1000 // task.interval_ms) if task.interval_ms > 0 else 1
+                self.dropped += steps - 1
+                self._run(task, steps)
+                if task.active:
+                    task.due += steps * task.interval_ms / 1000
+                    if task.due <= now:
+                        task.due = now + task.interval_ms / 1000
+            else:
+                task.cancel()
+                self._run(task)
+            took = (time.perf_counter() - t0) * 1000
+            if took > slowest_ms:
+                slowest, slowest_ms = task, took
+
+        self.frames += 1
+        self._check_budget((time.perf_counter() - start) * 1000, slowest, slowest_ms)
+        self._arm()
+
+    def _run(self, task, *args):
+        try:
+            task.callback(*args)
+        except Exception as e:
+            print(f"Animation {task.name} failed and was stopped: {e!r}")
+            task.cancel()
+
+    def _check_budget(self, frame_ms, slowest, slowest_ms):
+        if frame_ms <= self.budget_ms:
+            return
+        self.overruns += 1
+        self._unreported += 1
+        self.worst_ms = max(self.worst_ms, frame_ms)
+        now = self.clock()
+        if now - self._last_report >= self.report_every:
+            print(f"Frame took {frame_ms:.1f} ms (budget {self.budget_ms:.1f} ms), slowest: "
+                  f"{slowest.name if slowest else '?'} {slowest_ms:.1f} ms; "
+                  f"{self._unreported} slow frames, {self.dropped} frames dropped so far")
+            self._last_report = now
+            self._unreported = 0
+
+    def stats(self):
+        return {"frames": self.frames, "dropped": self.dropped, "overruns": self.overruns,
+                "worst_ms": round(self.worst_ms, 1), "tasks": len(self.tasks)}
+
+
+def frame_clock(widget):
+    """The FrameClock of the Tk root that `widget` belongs to, created on first use."""
+    root = widget
+    while root.master is not None:
+        root = root.master
+    clock = _clocks.get(root)
+    if clock is None:
+        clock = _clocks[root] = FrameClock(root)
+    return clock
+
+
+if __name__ == "__main__":
+    # Test harness on a simulated clock: two animations, one with a slow frame
+    class FakeRoot:
+        def __init__(self):
+            self.now, self.queue = 0.0, []
+        def after(self, ms, fn):
+            self.queue.append((self.now + ms / 1000, fn)); return fn
+        def after_cancel(self, handle):
+            self.queue = [q for q in self.queue if q[1] is not handle]
+        def run(self, until):
+            while self.queue and min(self.queue)[0] <= until:
+                when, fn = min(self.queue, key=lambda q: q[0])
+                self.queue.remove((when, fn)); self.now = when; fn()
+
+    root = FakeRoot()
+    clock = FrameClock(root, clock=lambda: root.now, report_every=0)
+    shown = []
+    clock.every(150, lambda steps: shown.append(steps), name="sprite")
+
+    def gif(steps):
+        if len(shown) == 5 and not gif.stalled:  # one frame blocks the loop for half a second
+            gif.stalled = True
+            time.sleep(0.03)
+            root.now += 0.5
+    gif.stalled = False
+    clock.every(60, gif, name="gif")
+    root.run(3.0)
+    print(f"sprite advanced {sum(shown)} frames in {len(shown)} calls (3 s / 150 ms = 20); {clock.stats()}")
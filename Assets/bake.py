@@ -0,0 +1,363 @@
+# Assets/bake.py
+"""
+Asset bake step
+---------------
+Does the image work ahead of time that pages would otherwise redo on every
+launch:
+
+- pre-scales images listed under "images" (none at the moment: the home
+  background used to be baked at 2x, but decoding 4x the pixels cost more than
+  Tk's zoom(2, 2) of the 1x file),
+- packs animation frames into one sprite sheet, so a page decodes one file and
+  slices frames out of it instead of decoding one file per frame,
+- writes a manifest with where everything is and the SHA-1 of each source, so
+  `--check` can tell when a bake is out of date. The app doesn't check at startup
+  (that would hash every source on every launch).
+
+HomePage only uses the sprite sheet with TOUCH_GRASS_BAKED_ASSETS=1, until the
+benchmark shows it is faster than the separate sprite files.
+
+PNG reading/writing is plain Python (zlib + struct), so baking needs nothing
+beyond the standard library. Run it again after changing any source image:
+
+    python -m Assets.bake            # bake everything in BAKE_JOBS
+    python -m Assets.bake --check    # exit 1 if the baked files are stale
+    python -m Assets.bake --benchmark  # time HomePage construction (headless numbers without a display)
+"""
+
+from __future__ import annotations
+from typing import List, NamedTuple
+import json, os, struct, sys, time, zlib
+
+if __package__ in (None, ""):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Assets.registry import content_hash, resolve
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Each job: pre-scale one image, or pack several frames into a sheet
+BAKE_JOBS = {
+    "manifest": "Homepage/baked/manifest.json",
+    "images": {},
+    "sheets": {
+        "sprites": {"sources": [f"Homepage/sprites/sprite{i}.png" for i in range(1, 5)],
+                    "file": "Homepage/baked/sprites.png"},
+    },
+}
+
+
+class Image(NamedTuple):
+    width: int
+    height: int
+    channels: int      # 3 = RGB, 4 = RGBA
+    pixels: bytearray  # rows top to bottom, no padding
+
+
+# ---- PNG ----
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(raw: bytes, width: int, height: int, bpp: int) -> bytearray:
+    stride = width * bpp
+    out = bytearray(stride * height)
+    prev = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        ftype = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if ftype == 1:    # Sub
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif ftype == 2:  # Up
+            for i in range(stride):
+                line[i] = (line[i] + prev[i]) & 0xFF
+        elif ftype == 3:  # Average
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif ftype == 4:  # Paeth
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                up_left = prev[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + _paeth(left, prev[i], up_left)) & 0xFF
+        elif ftype != 0:
+            raise ValueError(f"bad PNG filter type {ftype}")
+        out[y * stride:(y + 1) * stride] = line
+        prev = line
+    return out
+
+
+def read_png(path: str) -> Image:
+    """Decode an 8-bit, non-interlaced PNG to RGB or RGBA pixels."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"{path} is not a PNG")
+    pos, idat, palette, trns = len(PNG_SIGNATURE), [], None, None
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        body = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = body
+        elif kind == b"tRNS":
+            trns = body
+        elif kind == b"IDAT":
+            idat.append(body)
+        elif kind == b"IEND":
+            break
+    if depth != 8 or interlace:
+        raise ValueError(f"{path}: only 8-bit non-interlaced PNGs are supported")
+    bpp = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}[color_type]
+    raw = _unfilter(zlib.decompress(b"".join(idat)), width, height, bpp)
+
+    if color_type in (2, 6) and trns is None:
+        return Image(width, height, bpp, raw)
+    # Expand grey / palette / tRNS to RGBA
+    rgba = bytearray(width * height * 4)
+    if color_type == 3:
+        alpha = trns or b""
+        table = [palette[i * 3:i * 3 + 3] + bytes([alpha[i] if i < len(alpha) else 255])
+                 for i in range(len(palette) // 3)]
+        for i, index in enumerate(raw):
+            rgba[i * 4:i * 4 + 4] = table[index]
+    elif color_type == 2:
+        key = struct.unpack(">HHH", trns)
+        key = bytes(v & 0xFF for v in key)
+        for i in range(width * height):
+            px = raw[i * 3:i * 3 + 3]
+            rgba[i * 4:i * 4 + 4] = px + (b"\x00" if px == key else b"\xff")
+    else:
+        for i in range(width * height):
+            grey = raw[i * bpp]
+            alpha = raw[i * bpp + 1] if bpp == 2 else (0 if trns and grey == trns[1] else 255)
+            rgba[i * 4:i * 4 + 4] = bytes((grey, grey, grey, alpha))
+    return Image(width, height, 4, rgba)
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+def write_png(path: str, image: Image) -> None:
+    """Encode as RGB/RGBA PNG, picking None/Sub/Up per row (smallest absolute sum)."""
+    bpp, stride = image.channels, image.width * image.channels
+    out = bytearray()
+    prev = bytes(stride)
+    for y in range(image.height):
+        line = bytes(image.pixels[y * stride:(y + 1) * stride])
+        sub = line[:bpp] + bytes((line[i] - line[i - bpp]) & 0xFF for i in range(bpp, stride))
+        up = bytes((a - b) & 0xFF for a, b in zip(line, prev))
+        candidates = [(0, line), (1, sub), (2, up)]
+        ftype, body = min(candidates, key=lambda c: sum(v if v < 128 else 256 - v for v in c[1]))
+        out.append(ftype)
+        out += body
+        prev = line
+    color_type = 6 if bpp == 4 else 2
+    header = struct.pack(">IIBBBBB", image.width, image.height, 8, color_type, 0, 0, 0)
+    png = PNG_SIGNATURE + _chunk(b"IHDR", header) + _chunk(b"IDAT", zlib.compress(bytes(out), 9)) + _chunk(b"IEND", b"")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(png)
+    os.replace(tmp, path)
+
+
+# ---- image operations ----
+
+def zoom(image: Image, factor: int) -> Image:
+    """Nearest-neighbour upscale, the same result as PhotoImage.zoom(factor, factor)."""
+    if factor == 1:
+        return image
+    c, stride = image.channels, image.width * image.channels
+    out = bytearray()
+    for y in range(image.height):
+        row = image.pixels[y * stride:(y + 1) * stride]
+        wide = b"".join(bytes(row[x * c:(x + 1) * c]) * factor for x in range(image.width))
+        out += wide * factor
+    return Image(image.width * factor, image.height * factor, c, out)
+
+
+def to_rgba(image: Image) -> Image:
+    if image.channels == 4:
+        return image
+    rgb = image.pixels
+    out = bytearray(image.width * image.height * 4)
+    out[0::4], out[1::4], out[2::4] = rgb[0::3], rgb[1::3], rgb[2::3]
+    out[3::4] = b"\xff" * (image.width * image.height)
+    return Image(image.width, image.height, 4, out)
+
+
+def pack_row(images: List[Image]) -> tuple[Image, List[dict]]:
+    """Place frames left to right in one RGBA sheet; returns the sheet and each frame's rect."""
+    images = [to_rgba(img) for img in images]
+    width, height = sum(img.width for img in images), max(img.height for img in images)
+    sheet = bytearray(width * height * 4)
+    rects, x = [], 0
+    for img in images:
+        for y in range(img.height):
+            start = (y * width + x) * 4
+            sheet[start:start + img.width * 4] = img.pixels[y * img.width * 4:(y + 1) * img.width * 4]
+        rects.append({"x": x, "y": 0, "w": img.width, "h": img.height})
+        x += img.width
+    return Image(width, height, 4, sheet), rects
+
+
+# ---- jobs ----
+
+def bake(jobs: dict = BAKE_JOBS) -> dict:
+    """Run every job and write the manifest; returns the manifest."""
+    manifest = {"version": 1, "images": {}, "sheets": {}}
+    for name, job in jobs["images"].items():
+        img = zoom(read_png(resolve(job["source"])), job["zoom"])
+        write_png(resolve(job["file"]), img)
+        manifest["images"][name] = {"file": job["file"], "width": img.width, "height": img.height,
+                                    "source": job["source"], "sha1": content_hash(resolve(job["source"])),
+                                    "zoom": job["zoom"]}
+        print(f"baked {job['source']} x{job['zoom']} -> {job['file']}")
+    for name, job in jobs["sheets"].items():
+        sheet, rects = pack_row([read_png(resolve(src)) for src in job["sources"]])
+        write_png(resolve(job["file"]), sheet)
+        for rect, src in zip(rects, job["sources"]):
+            rect.update(source=src, sha1=content_hash(resolve(src)))
+        manifest["sheets"][name] = {"file": job["file"], "width": sheet.width, "height": sheet.height,
+                                    "frames": rects}
+        print(f"packed {len(rects)} frames -> {job['file']} ({sheet.width}x{sheet.height})")
+    path = resolve(jobs["manifest"])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def stale_sources(manifest: dict) -> List[str]:
+    """Sources that changed (or baked files that vanished) since the manifest was written."""
+    stale = []
+    entries = list(manifest.get("images", {}).values())
+    for sheet in manifest.get("sheets", {}).values():
+        if not os.path.exists(resolve(sheet["file"])):
+            stale.append(sheet["file"])
+        entries += sheet["frames"]
+    for entry in entries:
+        if "file" in entry and not os.path.exists(resolve(entry["file"])):
+            stale.append(entry["file"])
+        elif not os.path.exists(resolve(entry["source"])) or content_hash(resolve(entry["source"])) != entry["sha1"]:
+            stale.append(entry["source"])
+    return stale
+
+
+def _inflate(path: str) -> tuple[int, int]:
+    """Read a PNG and inflate its pixel data, as any decoder must; returns (width, height)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos, idat = len(PNG_SIGNATURE), []
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        if kind == b"IHDR":
+            width, height = struct.unpack(">II", data[pos + 8:pos + 16])
+        elif kind == b"IDAT":
+            idat.append(data[pos + 8:pos + 8 + length])
+        pos += 12 + length
+    zlib.decompress(b"".join(idat))
+    return width, height
+
+
+def benchmark_headless(runs: int = 50) -> None:
+    """The part of HomePage's image loading that doesn't need a display, for both paths:
+    opening and inflating each PNG, plus (baked) reading the manifest. Also counts the
+    pixels Tk then has to unfilter and zoom or copy."""
+    def background():
+        w, h = _inflate(resolve("Homepage/background.png"))
+        return w * h, (2 * w) * (2 * h)  # zoom(2, 2) writes the 2x image
+
+    def originals():
+        decoded, written = background()
+        sprites = [_inflate(resolve(f"Homepage/sprites/sprite{i}.png")) for i in range(1, 5)]
+        return 5, decoded + sum(sw * sh for sw, sh in sprites), written
+
+    def baked():
+        decoded, written = background()
+        with open(resolve(BAKE_JOBS["manifest"]), encoding="utf-8") as f:
+            sheet = json.load(f)["sheets"]["sprites"]
+        sw, sh = _inflate(resolve(sheet["file"]))
+        return 3, decoded + sw * sh, written + sum(r["w"] * r["h"] for r in sheet["frames"])  # copy -from
+
+    for label, load in (("originals", originals), ("baked", baked)):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            files, decoded, written = load()
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(f"{label:9}: {files} files, {decoded:7d} px decoded, {written:7d} px zoomed/copied; "
+              f"read+inflate median {times[len(times) // 2] * 1000:5.2f} ms over {runs} runs")
+
+
+def benchmark(runs: int = 20) -> None:
+    """Time HomePage construction with and without the baked assets. Needs a display;
+    without one, falls back to benchmark_headless.
+    The registry is cleared before every run so each one decodes from scratch."""
+    import tkinter as tk
+    from Assets.registry import asset_registry
+    from Homepage import homepage
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display ({e}); measuring the headless part of the loading path instead")
+        benchmark_headless()
+        return
+    root.withdraw()
+    use_baked = homepage.USE_BAKED_ASSETS
+    for label, baked in (("originals", False), ("baked", True)):
+        homepage.USE_BAKED_ASSETS = baked
+        times = []
+        for _ in range(runs):
+            asset_registry.clear()
+            start = time.perf_counter()
+            page = homepage.HomePage(root, None)
+            root.update_idletasks()
+            times.append(time.perf_counter() - start)
+            page.on_hide()
+            page.destroy()
+        times.sort()
+        print(f"HomePage() with {label:9}: median {times[len(times) // 2] * 1000:6.1f} ms, "
+              f"best {times[0] * 1000:6.1f} ms over {runs} runs")
+    homepage.USE_BAKED_ASSETS = use_baked
+    root.destroy()
+
+
+def main(argv=None) -> int:
+    import argparse  # HomePage imports this module at startup; keep argparse off that path
+
+    parser = argparse.ArgumentParser(description="Pre-scale images and pack sprite sheets.")
+    parser.add_argument("--check", action="store_true", help="only report whether the bake is up to date")
+    parser.add_argument("--benchmark", action="store_true", help="time HomePage construction before/after")
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark()
+        return 0
+    if args.check:
+        try:
+            with open(resolve(BAKE_JOBS["manifest"]), encoding="utf-8") as f:
+                stale = stale_sources(json.load(f))
+        except (OSError, ValueError):
+            stale = [BAKE_JOBS["manifest"]]
+        for path in stale:
+            print(f"out of date: {path}")
+        return 1 if stale else 0
+    bake()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+# Assets/registry.py
+"""
+Asset registry
+--------------
+One place that turns image files into PhotoImages.
+
+- Paths are resolved relative to the repository root, so pages work no matter
+  which directory the app is started from.
+- Files are identified by the SHA-1 of their content, so the same picture kept
+  in two folders (e.g. WorkTimer/ and work_timer_images/) is decoded once.
+- Every (content, zoom, subsample) PhotoImage is built once per interpreter and
+  shared by every page that asks for it; scaled versions are derived from the
+  cached original instead of decoding the file again.
+- Frames of a sprite sheet (see Assets/bake.py) are sliced out of one decode of
+  the sheet with Tk's `copy -from`, and cached the same way.
+
+PhotoImages belong to the Tk thread, so only use the registry from it.
+`asset_registry.summary()` reports hits, misses and the pixel memory held.
+"""
+
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+import hashlib, os
+import tkinter as tk
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def resolve(path: str) -> str:
+    """Absolute path of an asset given relative to the repository root."""
+    return path if os.path.isabs(path) else os.path.join(REPO_ROOT, path)
+
+
+def content_hash(path: str) -> str:
+    """SHA-1 of a file's bytes, read in chunks."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetRegistry:
+    """Content-addressed PhotoImage cache keyed by (sha1, zoom, subsample)."""
+
+    def __init__(self):
+        self._digests: Dict[tuple, str] = {}  # (abspath, mtime_ns, file size) -> content hash
+        self._images: Dict[Tuple[str, int, int], tk.PhotoImage] = {}
+        self._frames: Dict[Tuple[str, int, int, int, int], tk.PhotoImage] = {}  # (sheet sha1, x, y, w, h)
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, path: str) -> str:
+        """Content hash of `path`, hashed again only when the file changes."""
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = content_hash(path)
+        return digest
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(resolve(path))
+
+    def image(self, path: str, zoom: int = 1, subsample: int = 1) -> tk.PhotoImage:
+        """The PhotoImage for `path` zoomed by `zoom` then subsampled by `subsample`.
+        Raises OSError / tk.TclError if the file is missing or not an image."""
+        path = resolve(path)
+        digest = self.digest(path)
+        key = (digest, zoom, subsample)
+        img = self._images.get(key)
+        if img is not None:
+            self.hits += 1
+            return img
+        self.misses += 1
+        if (zoom, subsample) == (1, 1):
+            img = tk.PhotoImage(file=path)
+        else:
+            img = self.image(path)
+            if zoom > 1:
+                img = img.zoom(zoom, zoom)
+            if subsample > 1:
+                img = img.subsample(subsample, subsample)
+        self._images[key] = img
+        return img
+
+    def frames(self, sheet_path: str, rects: List[dict]) -> List[tk.PhotoImage]:
+        """Frames cut out of a sprite sheet; `rects` are dicts with x, y, w, h (the
+        manifest format). The sheet itself is only held while slicing."""
+        digest = self.digest(resolve(sheet_path))
+        keys = [(digest, r["x"], r["y"], r["w"], r["h"]) for r in rects]
+        missing = [key for key in keys if key not in self._frames]
+        self.hits += len(keys) - len(missing)
+        if missing:
+            self.misses += len(missing)
+            sheet = tk.PhotoImage(file=resolve(sheet_path))
+            for key in missing:
+                _, x, y, w, h = key
+                frame = tk.PhotoImage(width=w, height=h)
+                frame.tk.call(frame, "copy", sheet, "-from", x, y, x + w, y + h)
+                self._frames[key] = frame
+        return [self._frames[key] for key in keys]
+
+    def clear(self) -> None:
+        """Drop every cached image (pages still holding one keep it alive)."""
+        self._images.clear()
+        self._frames.clear()
+
+    def cached(self, path: str, zoom: int = 1, subsample: int = 1) -> Optional[tk.PhotoImage]:
+        """Like image() but never decodes: None unless it is already in the cache."""
+        try:
+            key = (self.digest(resolve(path)), zoom, subsample)
+        except OSError:
+            return None
+        return self._images.get(key)
+
+    def bytes_held(self) -> int:
+        """Approximate pixel memory of every cached image (4 bytes per pixel)."""
+        images = list(self._images.values()) + list(self._frames.values())
+        return sum(img.width() * img.height() * 4 for img in images)
+
+    def stats(self) -> dict:
+        return {
+            "images": len(self._images) + len(self._frames),
+            "files": len(set(self._digests.values())),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": self.bytes_held(),
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"assets: {s['images']} images from {s['files']} files, "
+                f"{s['hits']} hits / {s['misses']} misses, {s['bytes'] / 1e6:.1f} MB held")
+
+
+asset_registry = AssetRegistry()
+
+
+if __name__ == "__main__":
+    # Load every image the pages use twice (needs a display) and show the dedupe
+    root = tk.Tk()
+    root.withdraw()
+    for name in ["Homepage/background.png", "WorkTimer/computer-removebg-preview.png",
+                 "work_timer_images/computer-removebg-preview.png", "computer-removebg-preview.png"]:
+        asset_registry.image(name)
+        asset_registry.image(name, zoom=2)
+    for i in range(1, 5):
+        asset_registry.image(f"WorkTimer/posture{i}.png", zoom=4)
+        asset_registry.image(f"work_timer_images/posture{i}.png", zoom=4)
+    print(asset_registry.summary())
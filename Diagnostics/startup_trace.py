@@ -0,0 +1,250 @@
+# Diagnostics/startup_trace.py
+"""
+Startup tracer
+--------------
+Shows where launch time goes. Off by default; turn it on with either
+
+    TOUCH_GRASS_TRACE=1 python main.py          (or =path/to/trace.json)
+    python main.py --trace                       (or --trace=path/to/trace.json)
+
+While on it records nested spans for
+- module imports (every `import` that actually loads a module),
+- asset loads (PhotoImage from a file, zoom/subsample),
+- page construction and anything else wrapped in `tracer.span(...)`,
+plus Python heap allocations per span (tracemalloc) and the moment the first
+frame is drawn.
+
+The report is written in Chrome trace format (open it in chrome://tracing or
+https://ui.perfetto.dev) when the first frame is drawn, and again on exit so it
+also covers anything built afterwards (e.g. prewarmed pages). A short summary
+is printed to the console.
+
+First paint is when the main window is drawn. It opens only after someone logs
+in, so time spent waiting at the login prompt (begin_wait/end_wait) is recorded
+as its own span but not counted towards first paint.
+
+Note: tracemalloc only sees Python allocations. Pixel data of PhotoImages lives
+in Tk's own memory, so image spans show their wall time but little allocation.
+"""
+
+import atexit
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+TRACE_ENV = "TOUCH_GRASS_TRACE"
+TRACE_FLAG = "--trace"
+DEFAULT_TRACE_PATH = "startup_trace.json"
+
+
+class StartupTracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.origin = None
+        self.first_paint = None
+        self.waited = 0.0        # seconds spent waiting on the user, left out of first paint
+        self._wait_start = None
+        self.events = []
+        self._original_import = None
+        self._tk_patched = False
+
+    # ---- switching on ----
+
+    def start_from_args(self, argv=None):
+        """Start if TOUCH_GRASS_TRACE is set or `--trace[=path]` is on the command line.
+        The flag is removed from argv so nothing else sees it."""
+        argv = sys.argv if argv is None else argv
+        path = os.environ.get(TRACE_ENV) or None
+        for arg in list(argv[1:]):
+            if arg == TRACE_FLAG or arg.startswith(TRACE_FLAG + "="):
+                argv.remove(arg)
+                path = arg.partition("=")[2] or path or "1"
+        if path:
+            self.start(DEFAULT_TRACE_PATH if path == "1" else path)
+
+    def start(self, path=DEFAULT_TRACE_PATH):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.path = path
+        self.origin = time.perf_counter()
+        tracemalloc.start()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._traced_import
+        if hasattr(sys.modules.get("tkinter"), "PhotoImage"):
+            self._patch_tk()
+        atexit.register(self.dump)
+
+    # ---- spans ----
+
+    @contextmanager
+    def span(self, name, cat="app", **args):
+        """Time the body as one span (nested spans show up inside it). No-op when disabled."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        mem_before = tracemalloc.get_traced_memory()[0]
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            args["alloc_kb"] = round((tracemalloc.get_traced_memory()[0] - mem_before) / 1024, 1)
+            self.events.append({
+                "name": name, "cat": cat, "ph": "X",
+                "ts": round((start - self.origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(), "tid": threading.get_ident(),
+                "args": args,
+            })
+
+    def begin_wait(self, name):
+        """Start a stretch of waiting on the user (e.g. the login prompt); ended by end_wait."""
+        if self.enabled and self._wait_start is None:
+            self._wait_start = (name, time.perf_counter())
+
+    def end_wait(self):
+        if not self.enabled or self._wait_start is None:
+            return
+        (name, start), self._wait_start = self._wait_start, None
+        end = time.perf_counter()
+        self.waited += end - start
+        self.events.append({
+            "name": name, "cat": "wait", "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(), "tid": threading.get_ident(),
+            "args": {"alloc_kb": 0.0},
+        })
+
+    def _traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        module = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            module = f"{base}.{name}" if name else base
+        loaded = sys.modules.get(module)
+        if loaded is not None and all(hasattr(loaded, attr) for attr in fromlist or () if attr != "*"):
+            return original(name, globals, locals, fromlist, level)
+        if fromlist and loaded is not None:
+            module += f".{{{', '.join(fromlist)}}}"  # from package import submodule
+        with self.span(f"import {module}", "import"):
+            result = original(name, globals, locals, fromlist, level)
+        # tkinter runs imports of its own before PhotoImage exists
+        if not self._tk_patched and hasattr(sys.modules.get("tkinter"), "PhotoImage"):
+            self._patch_tk()
+        return result
+
+    def _patch_tk(self):
+        """Wrap PhotoImage so every image decode and resize is a span."""
+        import tkinter as tk
+
+        self._tk_patched = True
+        tracer = self
+        photo_init = tk.PhotoImage.__init__
+        zoom, subsample = tk.PhotoImage.zoom, tk.PhotoImage.subsample
+
+        def __init__(image, name=None, cnf={}, master=None, **kw):
+            path = kw.get("file") or cnf.get("file")
+            if not path:
+                return photo_init(image, name, cnf, master, **kw)
+            with tracer.span(f"load {os.path.basename(str(path))}", "asset", file=str(path)):
+                photo_init(image, name, cnf, master, **kw)
+
+        def traced_zoom(image, x, y=""):
+            with tracer.span(f"zoom {x}x", "asset", size=f"{image.width()}x{image.height()}"):
+                return zoom(image, x, y)
+
+        def traced_subsample(image, x, y=""):
+            with tracer.span(f"subsample 1/{x}", "asset", size=f"{image.width()}x{image.height()}"):
+                return subsample(image, x, y)
+
+        tk.PhotoImage.__init__ = __init__
+        tk.PhotoImage.zoom = traced_zoom
+        tk.PhotoImage.subsample = traced_subsample
+
+    # ---- first paint + report ----
+
+    def watch_first_paint(self, root):
+        """Record when `root` is first mapped and drawn, then write the report.
+        Time between begin_wait and end_wait is not counted."""
+        if not self.enabled:
+            return
+
+        def on_map(event):
+            if event.widget is root and self.first_paint is None:
+                # Tk redraws in idle callbacks; ours runs after the pending redraws
+                root.after_idle(mark)
+
+        def mark():
+            if self.first_paint is None:
+                now = time.perf_counter()
+                self.first_paint = now - self.origin - self.waited
+                self.events.append({
+                    "name": "first paint", "cat": "paint", "ph": "i", "s": "g",
+                    "ts": round((now - self.origin) * 1e6, 1),
+                    "pid": os.getpid(), "tid": threading.get_ident(),
+                })
+                self.dump()
+
+        root.bind("<Map>", on_map, add="+")
+
+    def dump(self):
+        if not self.enabled:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("filename")[:10]
+        report = {
+            "traceEvents": self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "first_paint_ms": None if self.first_paint is None else round(self.first_paint * 1000, 1),
+                "waited_ms": round(self.waited * 1000, 1),
+                "traced_memory_kb": round(current / 1024, 1),
+                "peak_memory_kb": round(peak / 1024, 1),
+                "top_allocations": [
+                    {"file": stat.traceback[0].filename, "kb": round(stat.size / 1024, 1), "blocks": stat.count}
+                    for stat in top
+                ],
+            },
+        }
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=1)
+        except OSError as e:
+            print(f"Could not write startup trace to {self.path}: {e}")
+            return
+        print(self.summary(report))
+
+    def summary(self, report, limit=8):
+        spans = [e for e in report["traceEvents"] if e["ph"] == "X" and e["cat"] != "wait"]
+        slowest = sorted(spans, key=lambda e: e["dur"], reverse=True)[:limit]
+        first_paint = report["otherData"]["first_paint_ms"]
+        waited = report["otherData"]["waited_ms"]
+        lines = [f"Startup trace written to {self.path} "
+                 f"(first paint: {'not yet' if first_paint is None else f'{first_paint:.0f} ms'}"
+                 f"{f' + {waited:.0f} ms at the login prompt' if waited else ''}, "
+                 f"peak Python heap {report['otherData']['peak_memory_kb']:.0f} KB)"]
+        for e in slowest:
+            lines.append(f"  {e['dur'] / 1000:8.1f} ms  {e['args']['alloc_kb']:8.1f} KB  {e['name']}")
+        return "\n".join(lines)
+
+
+tracer = StartupTracer()
+
+
+if __name__ == "__main__":
+    # Trace the app's own startup: python -m Diagnostics.startup_trace [path]
+    # (main.py starts the tracer itself; going through the env var keeps one tracer instance)
+    import runpy
+
+    os.environ[TRACE_ENV] = sys.argv[1] if len(sys.argv) > 1 else "1"
+    runpy.run_path(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py"),
+                   run_name="__main__")
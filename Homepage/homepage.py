@@ -1,6 +1,28 @@
 # homepage.py
+import json
+import os
 import tkinter as tk
 
+from Assets.registry import asset_registry, resolve
+from Animation.frame_clock import frame_clock
+
+# Sprite sheet written by `python -m Assets.bake`. Off by default: measured so far it is no faster
+# than the four sprite files (see `python -m Assets.bake --benchmark`). TOUCH_GRASS_BAKED_ASSETS=1 uses it.
+BAKED_MANIFEST = "Homepage/baked/manifest.json"
+USE_BAKED_ASSETS = os.environ.get("TOUCH_GRASS_BAKED_ASSETS") == "1"
+
+
+def load_baked_sprites():
+    """Sprite frames sliced from the baked sheet, or None if it isn't there. Staleness is
+    checked by `python -m Assets.bake --check`, not here, so startup never hashes the sources."""
+    try:
+        with open(resolve(BAKED_MANIFEST), encoding="utf-8") as f:
+            sheet = json.load(f)["sheets"]["sprites"]
+        return asset_registry.frames(sheet["file"], sheet["frames"])
+    except (OSError, ValueError, KeyError, tk.TclError):
+        return None
+
+
 class HomePage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
@@ -10,8 +32,14 @@ class HomePage(tk.Frame):
         self.main_body_frame = tk.Frame(self)
         self.main_body_frame.grid(row=0, column=0, sticky="nsew")
 
-        # Background Image
-        self.bg = tk.PhotoImage(file="Homepage/background.png").zoom(2, 2)
+        # Background Image (zoomed by Tk, cheaper than decoding a pre-scaled copy) + sprite frames
+        self.bg = asset_registry.image("Homepage/background.png", zoom=2)
+        self.frames = load_baked_sprites() if USE_BAKED_ASSETS else None
+        if self.frames is None:
+            self.frames = [
+                asset_registry.image(f"Homepage/sprites/sprite{i}.png")
+                for i in range(1, 5)
+            ]
 
         self.canvas = tk.Canvas(
             self.main_body_frame,
@@ -29,17 +57,11 @@ class HomePage(tk.Frame):
         )
 
         # Animated Sprite
-        self.frames = [
-            tk.PhotoImage(file=f"Homepage/sprites/sprite{i}.png")
-            for i in range(1, 5)
-        ]
         self.canvas.image_refs = self.frames  # prevent garbage collection
 
         # Place sprite in the center of the canvas
         sprite_x = self.bg.width() // 2
         sprite_y = self.bg.height() // 2
-        self.sprite = self.canvas.create_image(sprite_x, sprite_y, image=self.frames[0], anchor="center")
-
         self.sprite = self.canvas.create_image(
             sprite_x, sprite_y, 
             image=self.frames[0], 
@@ -51,7 +73,8 @@ class HomePage(tk.Frame):
 
         # Animation state
         self.frame_index = 0
-        self.animate()
+        self.animation = None
+        self.on_show()
 
         # Menu Setup (hidden initially)
         self.menu_buttons_frame_left = tk.Frame(self.main_body_frame, background="")
@@ -97,11 +120,21 @@ class HomePage(tk.Frame):
 
             self.menu_visible = True
 
-    def animate(self):
-        """Cycle through sprite frames for animation"""
-        self.frame_index = (self.frame_index + 1) % len(self.frames)
+    def animate(self, steps=1):
+        """Cycle through sprite frames for animation (skipping any the frame clock dropped)"""
+        self.frame_index = (self.frame_index + steps) % len(self.frames)
         self.canvas.itemconfig(self.sprite, image=self.frames[self.frame_index])
-        self.after(150, self.animate)  # call again after 150ms
+
+    def on_show(self):
+        """Page lifecycle hook (see App.show_frame): resume the sprite animation."""
+        if self.animation is None:
+            self.animation = frame_clock(self).every(150, self.animate, widget=self)  # every 150ms
+
+    def on_hide(self):
+        """Page lifecycle hook: stop animating while nobody can see it."""
+        if self.animation is not None:
+            self.animation.cancel()
+            self.animation = None
 
 
 if __name__ == "__main__":
@@ -2,20 +2,55 @@ import tkinter as tk
 from tkinter import messagebox
 from Login import services
 
+# How often a pending auth future is checked. ~60 polls a second keeps the UI
+# responsive without the result waiting noticeably after the hash finishes.
+POLL_INTERVAL_MS = 16
+
 class AuthWindow:
-    def __init__(self, root, on_success):
+    """Login/register window. Hides `root` until someone logs in (or a remembered session
+    resumes), then calls on_success(username). on_prompt, if given, is called when the
+    login window is actually shown."""
+
+    def __init__(self, root, on_success, on_prompt=None):
         self.root = root
         self.on_success = on_success
+        self.on_prompt = on_prompt
         self.root.withdraw()
+        self.auth_window = None
+
+        # Creating the tables and resuming a remembered session (which skips the login window
+        # and bcrypt entirely) both hit the database, so they run on the auth worker.
+        starting = services.submit(services.start_up)
+        self.root.after(POLL_INTERVAL_MS, self.poll_start_up, starting)
 
+    def poll_start_up(self, starting):
+        if not starting.done():
+            self.root.after(POLL_INTERVAL_MS, self.poll_start_up, starting)
+            return
+        try:
+            username = starting.result()
+        except Exception as e:
+            print(f"Could not resume the saved session: {e}")
+            username = None
+        if username:
+            self.on_success(username)
+        else:
+            self.open_login_window()
+
+    def open_login_window(self):
         self.auth_window = tk.Toplevel(self.root)
         self.auth_window.title("Login")
         self.auth_window.geometry("400x400")
         self.auth_window.resizable(True, True)
         self.auth_window.configure(bg="#2E3440")
+        # The root stays hidden until someone logs in, so closing this window quits the app
+        self.auth_window.protocol("WM_DELETE_WINDOW", self.root.destroy)
 
         self.current_frame = None
+        self.pending = None  # future of the auth call in flight, if any
         self.show_login_frame()
+        if self.on_prompt is not None:
+            self.on_prompt()
 
     def show_login_frame(self):
         if self.current_frame:
@@ -38,12 +73,17 @@ class AuthWindow:
                  fg="#D8DEE9", bg="#2E3440").pack(anchor="w")
         self.login_password_entry = tk.Entry(self.current_frame, font=("Arial", 12),
                                              width=30, show='*')
-        self.login_password_entry.pack(pady=(0, 20))
+        self.login_password_entry.pack(pady=(0, 8))
+
+        self.remember_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.current_frame, text="Remember me", variable=self.remember_var,
+                       font=("Arial", 11), fg="#D8DEE9", bg="#2E3440", selectcolor="#2E3440",
+                       activebackground="#2E3440", activeforeground="#D8DEE9").pack(anchor="w", pady=(0, 12))
 
         #Login Button
-        login_button = tk.Button(self.current_frame, text="Login", font=("Arial", 12),
-                                    command=self.handle_login, bg='#A3BE8C', fg='#2E3440')
-        login_button.pack(pady=(10))
+        self.login_button = tk.Button(self.current_frame, text="Login", font=("Arial", 12),
+                                      command=self.handle_login, bg='#A3BE8C', fg='#2E3440')
+        self.login_button.pack(pady=(10))
 
         #Switch to Register
         switch_button = tk.Button(self.current_frame, text="Don't have an account? Register",
@@ -83,9 +123,9 @@ class AuthWindow:
         self.register_duplicate_password_entry.pack(pady=(0, 20))
 
         #Register Button
-        register_button = tk.Button(self.current_frame, text="Register", font=("Arial", 12),
-                                    command=self.handle_register, bg='#A3BE8C', fg='#2E3440')
-        register_button.pack(pady=(10))
+        self.register_button = tk.Button(self.current_frame, text="Register", font=("Arial", 12),
+                                         command=self.handle_register, bg='#A3BE8C', fg='#2E3440')
+        self.register_button.pack(pady=(10))
 
         #switch to Login page
         switch_button = tk.Button(self.current_frame, text="Already have an account? Login",
@@ -93,14 +133,57 @@ class AuthWindow:
                                   activebackground='#2E3440', activeforeground='#D8DEE9')
         switch_button.pack()
 
+    def run_in_background(self, button, busy_text, fn, args, on_done):
+        """Runs fn(*args) on the auth worker pool and hands its result to on_done on the Tk thread.
+        Clicks while a call is already in flight are ignored."""
+        if self.pending is not None:
+            return
+        self.pending = services.submit(fn, *args)
+        idle_text = button.cget("text")
+        button.config(text=busy_text, state="disabled")
+        self.auth_window.config(cursor="watch")
+        self.auth_window.after(POLL_INTERVAL_MS, self.poll_pending, button, idle_text, on_done)
+
+    def poll_pending(self, button, idle_text, on_done):
+        if not self.pending.done():
+            self.auth_window.after(POLL_INTERVAL_MS, self.poll_pending, button, idle_text, on_done)
+            return
+
+        future, self.pending = self.pending, None
+        # The frame may have been swapped while the call was running.
+        if button.winfo_exists():
+            button.config(text=idle_text, state="normal")
+        self.auth_window.config(cursor="")
+
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", f"Something went wrong: {e}")
+            return
+        on_done(result)
+
     def handle_login(self):
         username = self.login_username_entry.get()
         password = self.login_password_entry.get()
 
-        if services.verify_user(username, password):
+        remember = self.remember_var.get()
+
+        self.run_in_background(self.login_button, "Logging in...", services.verify_user,
+                               (username, password),
+                               lambda verified: self.finish_login(verified, username, remember))
+
+    def finish_login(self, verified, username, remember):
+        if verified:
+            if remember:
+                services.remember_login(username)
             messagebox.showinfo("Success", "Login Successful!")
             self.auth_window.destroy()
-            self.on_success()
+            self.on_success(username)
+            return
+
+        retry_after = services.login_retry_after(username)
+        if retry_after > 0:
+            messagebox.showerror("Error", f"Too many failed attempts. Try again in {int(retry_after) + 1} seconds.")
         else:
             messagebox.showerror("Error", "Login Failed! Invalid useername or password.")
 
@@ -113,7 +196,11 @@ class AuthWindow:
             messagebox.showerror("Error", "Password is weak! It must be at least 8 characters long and contain at least one uppercase letter, one lowercase letter, and one digit")
             return
 
-        if services.create_user(username, password):
+        self.run_in_background(self.register_button, "Creating account...", services.create_user,
+                               (username, password, duplicate_password), self.finish_register)
+
+    def finish_register(self, created):
+        if created:
             messagebox.showinfo("Success", "User created successfully! Please log in.")
             self.show_login_frame()
         else:
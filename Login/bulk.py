@@ -0,0 +1,224 @@
+"""Bulk user provisioning: stream a cohort of users in from CSV/JSONL, and stream the users table back out.
+
+Usage from the project root:
+    python -m Login.bulk import cohort.csv
+    python -m Login.bulk export users.jsonl
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from Login import database, hashing, services
+
+# Rows hashed and inserted per transaction. Kept well under SQLite's bound-parameter limit.
+BATCH_SIZE = 500
+
+EXPORT_COLUMNS = ("username", "password_hash", "walk_streak", "work_streak")
+
+
+@dataclass
+class ImportReport:
+    """Outcome of import_users."""
+    inserted: int = 0
+    duplicates: list = field(default_factory=list)  # usernames already taken
+    invalid: list = field(default_factory=list)     # row numbers that failed validation (see _valid_row)
+
+
+def _file_format(path, fmt):
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported format {fmt!r}; expected 'csv' or 'jsonl'")
+    return fmt
+
+
+def read_users(path, fmt=None):
+    """Yields one dict per user from a CSV (with a header row) or JSONL file, without loading it whole."""
+    fmt = _file_format(path, fmt)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield None  # counted as an invalid row rather than ending the import
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _valid_streak(value):
+    """Streaks may be left out; otherwise a whole number >= 0 (CSV gives them as text)."""
+    if value is None or value == "":
+        return True
+    if isinstance(value, str):
+        try:
+            value = int(value)
+        except ValueError:
+            return False
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _valid_hash(password_hash):
+    """True for a hash check_password can read: a bcrypt hash or one of our scrypt strings."""
+    if not isinstance(password_hash, str):
+        return False
+    try:
+        params = hashing.params_of(password_hash)
+    except (ValueError, IndexError, KeyError):
+        return False
+    if params.backend == "bcrypt":
+        return password_hash[:4] in ("$2a$", "$2b$", "$2y$") and len(password_hash) == 60
+    parts = password_hash.split("$")
+    return len(parts) == 5 and set(item.split("=")[0] for item in parts[2].split(",")) == {"ln", "r", "p"}
+
+
+def _valid_row(row):
+    """Checks a row before anything is hashed or inserted: a username, a strong plaintext password
+    or a readable hash, and whole-number streaks."""
+    if not isinstance(row, dict):
+        return False
+    username, password, password_hash = row.get("username"), row.get("password"), row.get("password_hash")
+    if not isinstance(username, str) or not username.strip():
+        return False
+    if password_hash:
+        if not _valid_hash(password_hash):
+            return False
+    elif not isinstance(password, str) or not services.password_strong(password):
+        return False
+    return _valid_streak(row.get("walk_streak")) and _valid_streak(row.get("work_streak"))
+
+
+def _existing_usernames(usernames):
+    placeholders = ",".join("?" * len(usernames))
+    cursor = database.get_connection().execute(
+        f"SELECT username FROM users WHERE username IN ({placeholders})", usernames)
+    return {row[0] for row in cursor}
+
+
+def _import_batch(start, batch, params, pool, workers, report):
+    # Filter out invalid rows and duplicates before hashing, since hashing is the expensive part.
+    candidates = []
+    seen = set()
+    for number, row in enumerate(batch, start=start):
+        if not _valid_row(row):
+            report.invalid.append(number)
+            continue
+        username = row["username"].strip()
+        if username in seen:
+            report.duplicates.append(username)
+        else:
+            seen.add(username)
+            candidates.append((username, row))
+    if not candidates:
+        return
+
+    taken = _existing_usernames([username for username, _ in candidates])
+    report.duplicates.extend(username for username, _ in candidates if username in taken)
+    candidates = [(username, row) for username, row in candidates if username not in taken]
+
+    # Rows exported by export_users carry a hash already and are inserted as-is.
+    to_hash = [row["password"] for _, row in candidates if not row.get("password_hash")]
+    hashes = iter(pool.map(hashing.hash_password, to_hash, itertools.repeat(params),
+                           chunksize=max(1, len(to_hash) // (4 * workers))))
+    records = [
+        (username, row.get("password_hash") or next(hashes),
+         int(row.get("walk_streak") or 0), int(row.get("work_streak") or 0))
+        for username, row in candidates
+    ]
+
+    with database.transaction(immediate=True) as conn:
+        before = conn.total_changes
+        # OR IGNORE keeps the batch going if another writer took a username since the check above.
+        conn.executemany("INSERT OR IGNORE INTO users (username, password_hash, walk_streak, work_streak) "
+                         "VALUES (?, ?, ?, ?)", records)
+        inserted = conn.total_changes - before
+
+    if inserted < len(records):
+        ours = {username: password_hash for username, password_hash, _, _ in records}
+        cursor = database.get_connection().execute(
+            f"SELECT username, password_hash FROM users WHERE username IN ({','.join('?' * len(ours))})",
+            list(ours))
+        report.duplicates.extend(username for username, stored in cursor if stored != ours[username])
+    report.inserted += inserted
+
+
+def import_users(rows, batch_size=BATCH_SIZE, workers=None):
+    """Inserts users from an iterable of dicts with 'username' and 'password' (or 'password_hash').
+    Passwords are hashed in parallel across a process pool and each batch is one transaction.
+    Duplicate usernames are reported rather than aborting the import."""
+    params = hashing.current_params()  # calibrate once here so every worker uses the same cost
+    workers = workers or os.cpu_count() or 1
+    report = ImportReport()
+    start = 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(rows, batch_size):
+            _import_batch(start, batch, params, pool, workers, report)
+            start += len(batch)
+    return report
+
+
+def iter_users():
+    """Yields every user as a dict of EXPORT_COLUMNS, streaming rows from the cursor."""
+    cursor = database.get_connection().execute(
+        f"SELECT {', '.join(EXPORT_COLUMNS)} FROM users ORDER BY userID")
+    cursor.arraysize = BATCH_SIZE
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(EXPORT_COLUMNS, row))
+
+
+def export_users(path, fmt=None):
+    """Streams the users table to a CSV or JSONL file and returns the number of rows written."""
+    fmt = _file_format(path, fmt)
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+        for user in iter_users():
+            if fmt == "csv":
+                writer.writerow(user)
+            else:
+                f.write(json.dumps(user) + "\n")
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import or export users.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args(argv)
+
+    database.initialise_database()
+    if args.command == "import":
+        report = import_users(read_users(args.path, args.format), workers=args.workers)
+        print(f"Inserted {report.inserted} users.")
+        if report.duplicates:
+            print(f"Skipped {len(report.duplicates)} duplicate usernames: {', '.join(report.duplicates)}")
+        if report.invalid:
+            print(f"Skipped {len(report.invalid)} invalid rows: {', '.join(map(str, report.invalid))}")
+    else:
+        print(f"Exported {export_users(args.path, args.format)} users.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,46 +1,206 @@
+import os
 import sqlite3
-from operator import truediv
+import threading
+from contextlib import contextmanager
+
+from Login import hashing
+
+# Per-user, so running the app from a checkout never writes into the repo.
+# TOUCH_GRASS_DB points it somewhere else (e.g. a scratch copy).
+USER_DATABASE_NAME = os.path.join(os.path.expanduser("~"), ".touch_grass_user_data.db")
+DATABASE_NAME = os.environ.get("TOUCH_GRASS_DB") or USER_DATABASE_NAME
+
+# Where older versions kept the database (relative to wherever the app was started, usually
+# the project root, or Login/ when auth_ui.py was run on its own). The first time the per-user
+# database is opened, the first of these holding any accounts is copied into it.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LEGACY_DATABASE_NAMES = (
+    "user_data.db",
+    os.path.join(_PROJECT_ROOT, "user_data.db"),
+    os.path.join(_PROJECT_ROOT, "Login", "user_data.db"),
+)
+
+# Pragmas applied once to every new connection. WAL lets readers run alongside a
+# writer, NORMAL sync is durable in WAL mode, and a negative cache_size is in KiB.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -8000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+)
+
+_local = threading.local()
+_migrate_lock = threading.Lock()
+
+
+def _user_count(path):
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+
+
+def migrate_legacy_database(path=None, legacy_names=None):
+    """Copies the accounts of an old user_data.db into `path` (the per-user database) if `path`
+    doesn't exist yet. Returns the file copied from, or None. The copy goes through SQLite's
+    backup API, so it includes anything still in the old file's WAL."""
+    path = path or USER_DATABASE_NAME
+    with _migrate_lock:
+        if os.path.exists(path):
+            return None
+        for old in legacy_names or LEGACY_DATABASE_NAMES:
+            if os.path.exists(old) and os.path.abspath(old) != os.path.abspath(path) and _user_count(old):
+                src, dst = sqlite3.connect(old), sqlite3.connect(path)
+                try:
+                    src.backup(dst)
+                finally:
+                    src.close()
+                    dst.close()
+                print(f"Moved accounts from {os.path.abspath(old)} to {path}")
+                return old
+    return None
+
+
+def get_connection():
+    """Returns this thread's long-lived connection to DATABASE_NAME, opening it on first use."""
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(DATABASE_NAME)
+    if conn is None:
+        if DATABASE_NAME == USER_DATABASE_NAME:
+            migrate_legacy_database(DATABASE_NAME)
+        # isolation_level=None puts the driver in autocommit mode so that
+        # transaction() below is the only place a transaction is opened.
+        conn = sqlite3.connect(DATABASE_NAME, isolation_level=None)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        connections[DATABASE_NAME] = conn
+    return conn
+
+
+def close_connection():
+    """Closes every connection held by the calling thread."""
+    connections = getattr(_local, "connections", None) or {}
+    while connections:
+        _, conn = connections.popitem()
+        conn.close()
+
+
+@contextmanager
+def transaction(immediate=False):
+    """Runs the block in an explicit transaction, committing on success and rolling back on error."""
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    else:
+        conn.execute("COMMIT")
 
-import bcrypt
 
-DATABASE_NAME = 'user_data.db'
 def initialise_database():
     """Intialises the database and creates a user table if it doesn't exist."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute('''CREATE TABLE IF NOT EXISTS users (
+    with transaction(immediate=True) as conn:
+        conn.execute('''CREATE TABLE IF NOT EXISTS users (
         userID INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT NOT NULL UNIQUE, 
+        username TEXT NOT NULL UNIQUE,
         password_hash TEXT NOT NULL,
         walk_streak INTEGER DEFAULT 0,
         work_streak INTEGER DEFAULT 0
         )''')
+        # Covering indexes for the leaderboards: ordered by streak, tie-broken by username.
+        conn.execute("CREATE INDEX IF NOT EXISTS users_walk_streak_idx ON users (walk_streak DESC, username)")
+        conn.execute("CREATE INDEX IF NOT EXISTS users_work_streak_idx ON users (work_streak DESC, username)")
+        # "Remember me" sessions. Only a SHA-256 of each token is stored.
+        conn.execute('''CREATE TABLE IF NOT EXISTS sessions (
+        token_hash TEXT PRIMARY KEY,
+        userID INTEGER NOT NULL REFERENCES users (userID) ON DELETE CASCADE,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+        ) WITHOUT ROWID''')
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_idx ON sessions (expires_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_user_idx ON sessions (userID)")
+        # Failed logins, only written when the login throttle is set to persist.
+        conn.execute('''CREATE TABLE IF NOT EXISTS login_failures (
+        username TEXT NOT NULL,
+        failed_at REAL NOT NULL
+        )''')
+        conn.execute("CREATE INDEX IF NOT EXISTS login_failures_idx ON login_failures (username, failed_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS login_failures_age_idx ON login_failures (failed_at)")
+        # Work timer history (see history.py). Keyed by username rather than userID so the
+        # timer can record before anyone logs in (as "local").
+        conn.execute('''CREATE TABLE IF NOT EXISTS work_sessions (
+        sessionID INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        mode TEXT NOT NULL CHECK (mode IN ('work', 'break')),
+        started_at REAL NOT NULL,
+        ended_at REAL NOT NULL,
+        planned_seconds REAL NOT NULL,
+        actual_seconds REAL NOT NULL,
+        completed INTEGER NOT NULL
+        )''')
+        conn.execute("CREATE INDEX IF NOT EXISTS work_sessions_user_idx ON work_sessions (username, started_at)")
+        # Rollups kept up to date by history.record_session, so stats never scan work_sessions.
+        # `streak` is the number of consecutive days with a completed work session ending that day.
+        conn.execute('''CREATE TABLE IF NOT EXISTS daily_rollups (
+        username TEXT NOT NULL,
+        day TEXT NOT NULL,
+        work_seconds REAL NOT NULL DEFAULT 0,
+        break_seconds REAL NOT NULL DEFAULT 0,
+        sessions INTEGER NOT NULL DEFAULT 0,
+        completed_work INTEGER NOT NULL DEFAULT 0,
+        streak INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (username, day)
+        ) WITHOUT ROWID''')
+        conn.execute('''CREATE TABLE IF NOT EXISTS weekly_rollups (
+        username TEXT NOT NULL,
+        week TEXT NOT NULL,
+        work_seconds REAL NOT NULL DEFAULT 0,
+        break_seconds REAL NOT NULL DEFAULT 0,
+        sessions INTEGER NOT NULL DEFAULT 0,
+        completed_work INTEGER NOT NULL DEFAULT 0,
+        days_active INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (username, week)
+        ) WITHOUT ROWID''')
 
 def add_user(username, password):
     """Adds a new user to the database."""
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(password('utf-8'), salt)
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        try:
-            cursor.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, hashed_password.decode('utf-8')))
-            conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
+    hashed_password = hashing.hash_password(password)
+    try:
+        with transaction(immediate=True) as conn:
+            conn.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)", (username, hashed_password))
+        return True
+    except sqlite3.IntegrityError:
+        return False
 
 def get_user(username):
     """Returns a user from the database."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-        return cursor.fetchone()
+    cursor = get_connection().execute("SELECT * FROM users WHERE username = ?", (username,))
+    return cursor.fetchone()
 
 def verify_user(username, password):
-    """Verifies a user's password against the database."""
+    """Verifies a user's password against the database, upgrading its hash if the cost is out of date."""
     user = get_user(username)
-    if user:
-        password_hash = user[2].encode('utf-8')
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash)
-    else:
+    if not user:
         return False
+
+    password_hash = user[2]
+    if not hashing.check_password(password, password_hash):
+        return False
+
+    if hashing.needs_rehash(password_hash):
+        upgraded_hash = hashing.hash_password(password)
+        # Only replace the hash we checked, in case another login already upgraded it.
+        with transaction(immediate=True) as conn:
+            conn.execute("UPDATE users SET password_hash = ? WHERE userID = ? AND password_hash = ?",
+                         (upgraded_hash, user[0], password_hash))
+    return True
@@ -0,0 +1,138 @@
+import base64
+import hashlib
+import hmac
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+# bcrypt is imported on first use (see _bcrypt) so importing this module, which the
+# database layer does at startup, stays cheap.
+_bcrypt_module = None
+_bcrypt_loaded = False
+
+
+def _bcrypt():
+    """Returns the bcrypt module, or None when it isn't installed (scrypt from the standard
+    library is always available)."""
+    global _bcrypt_module, _bcrypt_loaded
+    if not _bcrypt_loaded:
+        try:
+            import bcrypt
+        except ImportError:
+            bcrypt = None
+        _bcrypt_module, _bcrypt_loaded = bcrypt, True
+    return _bcrypt_module
+
+# How long a single password check should take on this machine.
+TARGET_VERIFY_MS = 250
+
+# Backend to calibrate; "bcrypt" falls back to "scrypt" when bcrypt isn't installed.
+PREFERRED_BACKEND = os.environ.get("TOUCH_GRASS_HASH_BACKEND", "bcrypt")
+
+# Cost bounds. For bcrypt the cost is the log2 round count, for scrypt it is log2(N).
+BCRYPT_COST_RANGE = (10, 16)
+SCRYPT_COST_RANGE = (14, 17)
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_SALT_BYTES = 16
+SCRYPT_KEY_BYTES = 32
+
+
+@dataclass(frozen=True)
+class HashParams:
+    """Which backend to hash with and at what work factor."""
+    backend: str
+    cost: int
+
+
+_params = None
+_params_lock = threading.Lock()
+
+
+def _scrypt(password, salt, cost):
+    n = 1 << cost
+    return hashlib.scrypt(password, salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P,
+                          maxmem=256 * SCRYPT_R * n * SCRYPT_P, dklen=SCRYPT_KEY_BYTES)
+
+
+def _time_once(backend, cost):
+    password = b"calibration-password"
+    start = time.perf_counter()
+    if backend == "bcrypt":
+        bcrypt = _bcrypt()
+        bcrypt.hashpw(password, bcrypt.gensalt(rounds=cost))
+    else:
+        _scrypt(password, b"calibration-salt", cost)
+    return (time.perf_counter() - start) * 1000
+
+
+def calibrate(target_ms=TARGET_VERIFY_MS, backend=None):
+    """Benchmarks the backend and returns the highest cost whose verify time stays near target_ms."""
+    backend = backend or PREFERRED_BACKEND
+    if backend == "bcrypt" and _bcrypt() is None:
+        backend = "scrypt"
+    low, high = BCRYPT_COST_RANGE if backend == "bcrypt" else SCRYPT_COST_RANGE
+
+    # Both backends double in cost per step, so time a cheap probe and extrapolate.
+    probe = low - 2
+    elapsed = min(_time_once(backend, probe) for _ in range(3))
+    steps = math.floor(math.log2(target_ms / max(elapsed, 0.01)))
+    return HashParams(backend, max(low, min(high, probe + steps)))
+
+
+def current_params():
+    """Returns the calibrated parameters for this machine, calibrating on first use."""
+    global _params
+    with _params_lock:
+        if _params is None:
+            _params = calibrate()
+        return _params
+
+
+def hash_password(password, params=None):
+    """Hashes a password and returns a self-describing string that records the backend and cost."""
+    params = params or current_params()
+    secret = password.encode('utf-8')
+    if params.backend == "bcrypt":
+        bcrypt = _bcrypt()
+        return bcrypt.hashpw(secret, bcrypt.gensalt(rounds=params.cost)).decode('utf-8')
+
+    salt = os.urandom(SCRYPT_SALT_BYTES)
+    key = _scrypt(secret, salt, params.cost)
+    return "$scrypt$ln={},r={},p={}${}${}".format(
+        params.cost, SCRYPT_R, SCRYPT_P,
+        base64.b64encode(salt).decode('ascii'), base64.b64encode(key).decode('ascii'))
+
+
+def params_of(password_hash):
+    """Returns the HashParams a stored hash was created with."""
+    if password_hash.startswith("$scrypt$"):
+        settings = dict(item.split("=") for item in password_hash.split("$")[2].split(","))
+        return HashParams("scrypt", int(settings["ln"]))
+    # bcrypt: $2b$<cost>$<salt+hash>
+    return HashParams("bcrypt", int(password_hash.split("$")[2]))
+
+
+def check_password(password, password_hash):
+    """Checks a password against a stored hash from either backend."""
+    secret = password.encode('utf-8')
+    if password_hash.startswith("$scrypt$"):
+        _, _, settings, salt, key = password_hash.split("$")
+        settings = dict(item.split("=") for item in settings.split(","))
+        n, r, p = 1 << int(settings["ln"]), int(settings["r"]), int(settings["p"])
+        candidate = hashlib.scrypt(secret, salt=base64.b64decode(salt), n=n, r=r, p=p,
+                                   maxmem=256 * r * n * p, dklen=len(base64.b64decode(key)))
+        return hmac.compare_digest(candidate, base64.b64decode(key))
+    bcrypt = _bcrypt()
+    if bcrypt is None:
+        return False
+    return bcrypt.checkpw(secret, password_hash.encode('utf-8'))
+
+
+def needs_rehash(password_hash, params=None):
+    """True when a stored hash uses another backend or a lower cost than the current parameters."""
+    params = params or current_params()
+    stored = params_of(password_hash)
+    return stored.backend != params.backend or stored.cost < params.cost
@@ -0,0 +1,176 @@
+"""Work timer history: one row per work/break period plus daily and weekly rollups.
+
+record_session() writes the raw session and updates that day's and week's
+rollup rows in the same transaction, so the stats functions below are single
+primary-key lookups (or a short range over them) and never scan work_sessions.
+
+Days are local calendar days and a session counts towards the day it ended on.
+A day keeps the work streak going if it has at least one completed work session
+(one that ran to the end of its period); the streak ending on each day is stored
+in its daily row, so extending it only needs yesterday's row. users.work_streak
+is kept in step for the leaderboard: record_session raises it, and
+expire_streaks (run by the session cleanup thread) zeroes it once a day is missed.
+"""
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from Login import database
+
+LOCAL_USER = "local"
+
+DayStats = namedtuple("DayStats", "day work_seconds break_seconds sessions completed_work streak")
+WeekStats = namedtuple("WeekStats", "week work_seconds break_seconds sessions completed_work days_active")
+
+_initialised = set()  # database files whose tables we've made sure of
+
+
+def ensure_tables():
+    """Creates the tables (once per database file). The login gate calls this (services.start_up) on
+    the auth worker, so the first record_session on the Tk thread doesn't run any DDL."""
+    if database.DATABASE_NAME not in _initialised:
+        database.initialise_database()
+        _initialised.add(database.DATABASE_NAME)
+
+
+def day_key(day):
+    return day.isoformat()
+
+
+def week_key(day):
+    """ISO week, e.g. '2025-W07'."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def record_session(username, mode, started_at, ended_at, planned_seconds, actual_seconds, completed):
+    """Stores one finished (or abandoned) period and folds it into the rollups.
+    Times are wall-clock timestamps; `mode` is 'work' or 'break'. Returns the new streak."""
+    ensure_tables()
+    username = username or LOCAL_USER
+    day = datetime.fromtimestamp(ended_at).date()
+    work = actual_seconds if mode == "work" else 0.0
+    rest = actual_seconds if mode == "break" else 0.0
+    completed_work = 1 if (mode == "work" and completed) else 0
+
+    with database.transaction(immediate=True) as conn:
+        conn.execute("INSERT INTO work_sessions (username, mode, started_at, ended_at, planned_seconds, "
+                     "actual_seconds, completed) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (username, mode, started_at, ended_at, planned_seconds, actual_seconds, int(bool(completed))))
+
+        row = conn.execute("SELECT work_seconds, completed_work, streak FROM daily_rollups "
+                           "WHERE username = ? AND day = ?", (username, day_key(day))).fetchone()
+        was_active = row is not None and row[0] > 0
+        streak = row[2] if row else 0
+        if completed_work and not (row and row[1]):
+            # First completed work session today: extend yesterday's streak (if any)
+            yesterday = conn.execute("SELECT streak FROM daily_rollups WHERE username = ? AND day = ?",
+                                     (username, day_key(day - timedelta(days=1)))).fetchone()
+            streak = (yesterday[0] if yesterday else 0) + 1
+            conn.execute("UPDATE users SET work_streak = ? WHERE username = ?", (streak, username))
+
+        conn.execute(
+            "INSERT INTO daily_rollups (username, day, work_seconds, break_seconds, sessions, completed_work, streak) "
+            "VALUES (?, ?, ?, ?, 1, ?, ?) ON CONFLICT (username, day) DO UPDATE SET "
+            "work_seconds = work_seconds + excluded.work_seconds, break_seconds = break_seconds + excluded.break_seconds, "
+            "sessions = sessions + 1, completed_work = completed_work + excluded.completed_work, streak = excluded.streak",
+            (username, day_key(day), work, rest, completed_work, streak))
+        conn.execute(
+            "INSERT INTO weekly_rollups (username, week, work_seconds, break_seconds, sessions, completed_work, days_active) "
+            "VALUES (?, ?, ?, ?, 1, ?, ?) ON CONFLICT (username, week) DO UPDATE SET "
+            "work_seconds = work_seconds + excluded.work_seconds, break_seconds = break_seconds + excluded.break_seconds, "
+            "sessions = sessions + 1, completed_work = completed_work + excluded.completed_work, "
+            "days_active = days_active + excluded.days_active",
+            (username, week_key(day), work, rest, completed_work, int(work > 0 and not was_active)))
+    return streak
+
+
+def expire_streaks(today=None):
+    """Zeroes users.work_streak for everyone whose streak has lapsed (no completed work today or
+    yesterday), since record_session only writes it when a session is recorded. Users with no
+    history at all, e.g. imported with a streak, are left alone. Returns how many were reset."""
+    ensure_tables()
+    today = today or date.today()
+    with database.transaction(immediate=True) as conn:
+        before = conn.total_changes
+        conn.execute(
+            "UPDATE users SET work_streak = 0 WHERE work_streak > 0 "
+            "AND EXISTS (SELECT 1 FROM daily_rollups d WHERE d.username = users.username) "
+            "AND NOT EXISTS (SELECT 1 FROM daily_rollups d WHERE d.username = users.username "
+            "AND d.day IN (?, ?) AND d.completed_work > 0)",
+            (day_key(today), day_key(today - timedelta(days=1))))
+        return conn.total_changes - before
+
+
+def day_stats(username, day=None):
+    """DayStats for `day` (default today); zeros if nothing was recorded."""
+    ensure_tables()
+    day = day or date.today()
+    row = database.get_connection().execute(
+        "SELECT work_seconds, break_seconds, sessions, completed_work, streak FROM daily_rollups "
+        "WHERE username = ? AND day = ?", (username or LOCAL_USER, day_key(day))).fetchone()
+    return DayStats(day_key(day), *(row or (0.0, 0.0, 0, 0, 0)))
+
+
+def week_stats(username, day=None):
+    """WeekStats for the ISO week containing `day` (default today)."""
+    ensure_tables()
+    week = week_key(day or date.today())
+    row = database.get_connection().execute(
+        "SELECT work_seconds, break_seconds, sessions, completed_work, days_active FROM weekly_rollups "
+        "WHERE username = ? AND week = ?", (username or LOCAL_USER, week)).fetchone()
+    return WeekStats(week, *(row or (0.0, 0.0, 0, 0, 0)))
+
+
+def focus_minutes_this_week(username, today=None):
+    return week_stats(username, today).work_seconds / 60
+
+
+def current_streak(username, today=None):
+    """Consecutive days with completed work, ending today or (if today has none yet) yesterday."""
+    ensure_tables()
+    today = today or date.today()
+    rows = database.get_connection().execute(
+        "SELECT day, streak FROM daily_rollups WHERE username = ? AND day IN (?, ?)",
+        (username or LOCAL_USER, day_key(today), day_key(today - timedelta(days=1)))).fetchall()
+    streaks = dict(rows)
+    return streaks.get(day_key(today)) or streaks.get(day_key(today - timedelta(days=1))) or 0
+
+
+def recent_days(username, days=7, today=None):
+    """DayStats for the last `days` days up to today, oldest first (missing days are zeros)."""
+    ensure_tables()
+    today = today or date.today()
+    first = today - timedelta(days=days - 1)
+    rows = database.get_connection().execute(
+        "SELECT day, work_seconds, break_seconds, sessions, completed_work, streak FROM daily_rollups "
+        "WHERE username = ? AND day BETWEEN ? AND ?", (username or LOCAL_USER, day_key(first), day_key(today)))
+    found = {row[0]: DayStats(*row) for row in rows}
+    return [found.get(day_key(first + timedelta(days=i)), DayStats(day_key(first + timedelta(days=i)), 0.0, 0.0, 0, 0, 0))
+            for i in range(days)]
+
+
+if __name__ == "__main__":
+    # Record a fortnight of sessions into a scratch database and read the stats back
+    import os, tempfile, time
+
+    original = database.DATABASE_NAME
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_NAME = os.path.join(tmp, "history_demo.db")
+        start_day = date.today() - timedelta(days=13)
+        for i in range(14):
+            if i == 5:
+                continue  # a day off breaks the streak
+            noon = datetime.combine(start_day + timedelta(days=i), datetime.min.time()).timestamp() + 12 * 3600
+            for n in range(4):
+                t = noon + n * 3300
+                record_session("demo", "work", t, t + 3000, 3000, 3000, True)
+                record_session("demo", "break", t + 3000, t + 3300, 300, 300, True)
+        begin = time.perf_counter()
+        for _ in range(1000):
+            focus_minutes_this_week("demo")
+            current_streak("demo")
+        took = (time.perf_counter() - begin) / 1000
+        print(f"streak {current_streak('demo')} days, {focus_minutes_this_week('demo'):.0f} focus minutes this week, "
+              f"{took * 1e6:.0f} us per stats lookup")
+        database.close_connection()
+    database.DATABASE_NAME = original
@@ -0,0 +1,129 @@
+"""Streak leaderboards over the users table.
+
+Ordering is by streak (highest first), then username, and every query walks the
+(streak DESC, username) covering index created in database.initialise_database.
+Pages are fetched with keyset pagination: pass the last (streak, username) seen
+as `after` instead of an OFFSET, so deep pages cost the same as the first one.
+
+Run this file directly for a latency benchmark as the table grows.
+"""
+import os
+import sys
+from collections import namedtuple
+
+# Allow `python Login/leaderboard.py` from the project root as well as `python -m Login.leaderboard`.
+if __package__ in (None, ""):
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Login import database
+
+STREAK_COLUMNS = {"walk": "walk_streak", "work": "work_streak"}
+
+LeaderboardEntry = namedtuple("LeaderboardEntry", "rank username streak")
+
+
+def _column(streak):
+    try:
+        return STREAK_COLUMNS[streak]
+    except KeyError:
+        raise ValueError(f"Unknown streak {streak!r}; expected one of {', '.join(STREAK_COLUMNS)}") from None
+
+
+def page(streak, limit=50, after=None):
+    """Returns up to `limit` (username, streak) rows following the `after` cursor, best first."""
+    col = _column(streak)
+    if after is None:
+        cursor = database.get_connection().execute(
+            f"SELECT username, {col} FROM users ORDER BY {col} DESC, username LIMIT ?", (limit,))
+    else:
+        value, username = after
+        # The `<=` bound is what lets SQLite seek into the index; the OR trims the tie.
+        cursor = database.get_connection().execute(
+            f"SELECT username, {col} FROM users WHERE {col} <= ? AND ({col} < ? OR username > ?) "
+            f"ORDER BY {col} DESC, username LIMIT ?", (value, value, username, limit))
+    return cursor.fetchall()
+
+
+def top(streak, n=10):
+    """Returns the n best users for a streak as LeaderboardEntry rows."""
+    return [LeaderboardEntry(rank, username, value)
+            for rank, (username, value) in enumerate(page(streak, n), start=1)]
+
+
+def _streak_of(username, col):
+    row = database.get_connection().execute(
+        f"SELECT {col} FROM users WHERE username = ?", (username,)).fetchone()
+    return None if row is None else row[0]
+
+
+def rank(username, streak):
+    """Returns a user's 1-based position on a leaderboard, or None if they don't exist."""
+    col = _column(streak)
+    value = _streak_of(username, col)
+    if value is None:
+        return None
+    # Two range counts over the index: everyone strictly ahead, plus ties earlier in the alphabet.
+    ahead = database.get_connection().execute(
+        f"SELECT (SELECT COUNT(*) FROM users WHERE {col} > ?) + "
+        f"(SELECT COUNT(*) FROM users WHERE {col} = ? AND username < ?)",
+        (value, value, username)).fetchone()[0]
+    return ahead + 1
+
+
+def around(username, streak, radius=2):
+    """Returns the user's entry with up to `radius` neighbours on each side, best first."""
+    col = _column(streak)
+    value = _streak_of(username, col)
+    if value is None:
+        return []
+    position = rank(username, streak)
+
+    above = database.get_connection().execute(
+        f"SELECT username, {col} FROM users WHERE {col} >= ? AND ({col} > ? OR username < ?) "
+        f"ORDER BY {col}, username DESC LIMIT ?", (value, value, username, radius)).fetchall()
+    below = page(streak, radius, after=(value, username))
+
+    rows = above[::-1] + [(username, value)] + below
+    first = position - len(above)
+    return [LeaderboardEntry(first + i, name, streak_value) for i, (name, streak_value) in enumerate(rows)]
+
+
+def _benchmark(sizes=(1_000, 10_000, 100_000, 250_000), repeats=200):
+    import random
+    import tempfile
+    import time
+
+    def per_call_ms(fn):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        return (time.perf_counter() - start) * 1000 / repeats
+
+    original = database.DATABASE_NAME
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE_NAME = os.path.join(tmp, "leaderboard_bench.db")
+        database.initialise_database()
+        rng = random.Random(0)
+        print(f"{'rows':>8} {'top10':>8} {'page@mid':>9} {'rank':>8} {'around':>8}  (ms per call)")
+        count = 0
+        for size in sizes:
+            with database.transaction(immediate=True) as conn:
+                conn.executemany(
+                    "INSERT INTO users (username, password_hash, walk_streak, work_streak) VALUES (?, '-', ?, ?)",
+                    ((f"user{i:07d}", rng.randint(0, 365), rng.randint(0, 365)) for i in range(count, size)))
+            count = size
+            conn.execute("ANALYZE")
+
+            middle = f"user{size // 2:07d}"
+            cursor = (_streak_of(middle, "walk_streak"), middle)
+            print(f"{size:>8} "
+                  f"{per_call_ms(lambda: top('walk')):>8.3f} "
+                  f"{per_call_ms(lambda: page('walk', 50, after=cursor)):>9.3f} "
+                  f"{per_call_ms(lambda: rank(middle, 'walk')):>8.3f} "
+                  f"{per_call_ms(lambda: around(middle, 'walk')):>8.3f}")
+        database.close_connection()
+    database.DATABASE_NAME = original
+
+
+if __name__ == "__main__":
+    _benchmark()
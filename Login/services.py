@@ -1,9 +1,97 @@
-from Login import database
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from Login import database, history, sessions
+
+# bcrypt releases the GIL while hashing, so a couple of threads are enough to keep
+# hashing off the Tk main loop. Each worker gets its own database connection.
+_auth_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auth")
+
+
+class LoginThrottle:
+    "Sliding window of failed logins per username, checked before any password hashing"
+
+    def __init__(self, max_failures: int = 5, window: float = 300, max_entries: int = 10_000,
+                 persist: bool = False):
+        self.max_failures = max_failures
+        self.window = window
+        self.max_entries = max_entries
+        self.persist = persist
+        # username -> timestamps of the latest failures, least recently used first.
+        # Only the last max_failures timestamps matter, so each deque is capped at that.
+        self._failures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _entry(self, username: str) -> deque:
+        entry = self._failures.get(username)
+        if entry is None:
+            entry = deque(maxlen=self.max_failures)
+            if self.persist:
+                cursor = database.get_connection().execute(
+                    "SELECT failed_at FROM login_failures WHERE username = ? AND failed_at > ? "
+                    "ORDER BY failed_at DESC LIMIT ?", (username, time.time() - self.window, self.max_failures))
+                entry.extend(sorted(row[0] for row in cursor))
+            self._failures[username] = entry
+            if len(self._failures) > self.max_entries:
+                self._failures.popitem(last=False)
+        else:
+            self._failures.move_to_end(username)
+        return entry
+
+    def retry_after(self, username: str) -> float:
+        "Seconds until username may try again; 0 if it isn't throttled"
+        with self._lock:
+            entry = self._entry(username)
+            if len(entry) < self.max_failures:
+                return 0
+            return max(0, entry[0] + self.window - time.time())
+
+    def record_failure(self, username: str) -> None:
+        "Counts a failed attempt against username"
+        now = time.time()
+        with self._lock:
+            self._entry(username).append(now)
+        if self.persist:
+            with database.transaction(immediate=True) as conn:
+                conn.execute("DELETE FROM login_failures WHERE username = ? AND failed_at <= ?",
+                             (username, now - self.window))
+                conn.execute("INSERT INTO login_failures (username, failed_at) VALUES (?, ?)", (username, now))
+
+    def prune(self) -> int:
+        "Deletes persisted failures older than the window for every username; returns how many"
+        if not self.persist:
+            return 0
+        with database.transaction(immediate=True) as conn:
+            return conn.execute("DELETE FROM login_failures WHERE failed_at <= ?",
+                                (time.time() - self.window,)).rowcount
+
+    def record_success(self, username: str) -> None:
+        "Clears the failure history of username"
+        with self._lock:
+            self._failures.pop(username, None)
+        if self.persist:
+            with database.transaction(immediate=True) as conn:
+                conn.execute("DELETE FROM login_failures WHERE username = ?", (username,))
+
+
+login_throttle = LoginThrottle()
+
+
+def prune_login_failures() -> int:
+    "Drops stale failures of usernames that never log in again (run by the session cleanup thread)"
+    return login_throttle.prune()
+
+
+sessions.cleanup_tasks.append(prune_login_failures)
+# The cleanup thread starts with resume_session, so lapsed streaks are cleared at launch too
+sessions.cleanup_tasks.append(history.expire_streaks)
 
 
 def username_exists(username: str) -> bool:
     "Checks if a username already exists"
-    return database.get_username(username) is not None
+    return database.get_user(username) is not None
 
 def add_user(username: str, password: str) -> bool:
     "Adds a new user to the database"
@@ -40,4 +128,44 @@ def create_user(username: str, password: str, password_duplicate) -> bool:
 
 def verify_user(username: str, password: str) -> bool:
     "Checks if a username exists in the database and password is strong and matches"
-    return database.verify_user(username, password)
+    if login_throttle.retry_after(username) > 0:
+        return False
+    if database.verify_user(username, password):
+        login_throttle.record_success(username)
+        return True
+    login_throttle.record_failure(username)
+    return False
+
+def login_retry_after(username: str) -> float:
+    "Seconds until a throttled username may try to log in again; 0 if it isn't throttled"
+    return login_throttle.retry_after(username)
+
+def submit(fn, *args) -> Future:
+    "Runs a (slow, hashing) service call on the auth worker pool and returns its future"
+    return _auth_executor.submit(fn, *args)
+
+def remember_login(username: str) -> None:
+    "Creates a session for a logged in user and saves its token for the next launch"
+    token = sessions.create_session(username)
+    if token:
+        sessions.save_token(token)
+
+def resume_session():
+    "Returns the username of a saved, still valid session (skipping password checks), or None"
+    sessions.start_cleanup()
+    token = sessions.load_token()
+    if not token:
+        return None
+    username = sessions.resolve_session(token)
+    if username is None:
+        sessions.forget_token()
+    return username
+
+def start_up():
+    "Creates any missing tables, then resumes a saved session. Touches the database, so the login gate runs it via submit"
+    history.ensure_tables()
+    return resume_session()
+
+def logout() -> None:
+    "Revokes the saved session so the next launch asks for a password again"
+    sessions.forget_token()
@@ -0,0 +1,118 @@
+"""Persistent "remember me" sessions.
+
+A random token is handed to the client and saved in ~/.touch_grass_session;
+the database only keeps its SHA-256, so resuming a session is one indexed
+primary-key read with no bcrypt involved.
+"""
+import hashlib
+import os
+import secrets
+import threading
+import time
+
+from Login import database
+
+SESSION_TTL = 30 * 24 * 60 * 60      # seconds a remembered login stays valid
+CLEANUP_INTERVAL = 60 * 60           # seconds between background purges of expired sessions
+TOKEN_PATH = os.path.join(os.path.expanduser("~"), ".touch_grass_session")
+
+_cleanup_thread = None
+_cleanup_lock = threading.Lock()
+
+
+def _digest(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def create_session(username, ttl=SESSION_TTL):
+    """Creates a session for an existing user and returns its token, or None if the user doesn't exist."""
+    token = secrets.token_urlsafe(32)
+    now = time.time()
+    with database.transaction(immediate=True) as conn:
+        cursor = conn.execute(
+            "INSERT INTO sessions (token_hash, userID, created_at, expires_at) "
+            "SELECT ?, userID, ?, ? FROM users WHERE username = ?",
+            (_digest(token), now, now + ttl, username))
+        if cursor.rowcount == 0:
+            return None
+    return token
+
+
+def resolve_session(token):
+    """Returns the username for a live session token, or None if it is unknown, revoked or expired."""
+    row = database.get_connection().execute(
+        "SELECT u.username FROM sessions s JOIN users u ON u.userID = s.userID "
+        "WHERE s.token_hash = ? AND s.expires_at > ?", (_digest(token), time.time())).fetchone()
+    return None if row is None else row[0]
+
+
+def revoke_session(token):
+    """Revokes a single session token."""
+    with database.transaction(immediate=True) as conn:
+        conn.execute("DELETE FROM sessions WHERE token_hash = ?", (_digest(token),))
+
+
+def revoke_user_sessions(username):
+    """Revokes every session belonging to a user, e.g. after a password change."""
+    with database.transaction(immediate=True) as conn:
+        conn.execute("DELETE FROM sessions WHERE userID = (SELECT userID FROM users WHERE username = ?)",
+                     (username,))
+
+
+def purge_expired():
+    """Deletes expired sessions and returns how many were removed."""
+    with database.transaction(immediate=True) as conn:
+        return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+# Run by the cleanup thread every interval; other modules add their own purges here.
+cleanup_tasks = [purge_expired]
+
+
+def start_cleanup(interval=CLEANUP_INTERVAL):
+    """Starts (once) a daemon thread that runs cleanup_tasks (expired sessions etc.) every `interval` seconds."""
+    global _cleanup_thread
+    with _cleanup_lock:
+        if _cleanup_thread is not None:
+            return
+
+        def _run():
+            while True:
+                for task in cleanup_tasks:
+                    try:
+                        task()
+                    except Exception as e:
+                        print(f"Cleanup {task.__name__} failed: {e}")
+                time.sleep(interval)
+
+        _cleanup_thread = threading.Thread(target=_run, name="session-cleanup", daemon=True)
+        _cleanup_thread.start()
+
+
+# ---- token saved on this machine ----
+
+def save_token(token):
+    """Saves the token for the next launch, readable only by the current user."""
+    fd = os.open(TOKEN_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+
+
+def load_token():
+    """Returns the saved token, or None if there isn't one."""
+    try:
+        with open(TOKEN_PATH, "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def forget_token():
+    """Revokes the saved session (if any) and deletes it from this machine."""
+    token = load_token()
+    if token:
+        revoke_session(token)
+    try:
+        os.remove(TOKEN_PATH)
+    except OSError:
+        pass
@@ -0,0 +1,159 @@
+# Profile/gif_reader.py
+"""
+GIF reader
+----------
+Pure-Python, single pass over a GIF89a/87a container. No pixels are decoded
+here: each frame is re-wrapped as a tiny standalone GIF (its own colour table,
+transparency and LZW data) so Tk can decode it directly, without re-parsing
+the whole file for every `-index`. Along the way we keep what Tk throws away:
+per-frame delays, disposal methods, offsets and the loop count.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List, Optional
+import struct
+
+# Browsers treat 0/1 centisecond delays as "as fast as possible" and play them at 100 ms.
+MIN_DELAY_MS = 20
+DEFAULT_DELAY_MS = 100
+
+# Disposal methods (GIF89a spec, section 23)
+DISPOSE_NONE       = 0  # unspecified: leave the frame in place
+DISPOSE_KEEP       = 1  # leave the frame in place
+DISPOSE_BACKGROUND = 2  # clear the frame's rectangle before the next frame
+DISPOSE_PREVIOUS   = 3  # restore what was under the frame before the next frame
+
+
+class GifError(ValueError):
+    """Raised for data that isn't a GIF we can read."""
+
+
+@dataclass
+class GifFrame:
+    """One image in the file, positioned on the logical screen."""
+    left: int
+    top: int
+    width: int
+    height: int
+    delay_ms: int
+    disposal: int
+    transparent_index: Optional[int]
+    data: bytes  # a complete single-frame GIF, ready for tk.PhotoImage(data=...)
+
+
+@dataclass
+class GifInfo:
+    width: int
+    height: int
+    loop_count: Optional[int] = None  # None: play once; 0: loop forever
+    frames: List[GifFrame] = field(default_factory=list)
+
+
+def _color_table_size(packed: int) -> int:
+    return 3 * (2 << (packed & 0x07))
+
+
+def _need(data: bytes, pos: int, count: int, what: str) -> None:
+    """Raise GifError unless `count` bytes starting at `pos` are present."""
+    if pos + count > len(data):
+        raise GifError(f"truncated {what} at offset {pos}")
+
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+    """Return the offset just past a chain of data sub-blocks starting at `pos`."""
+    n = len(data)
+    while pos < n:
+        size = data[pos]
+        pos += 1 + size
+        if size == 0:
+            return pos
+    raise GifError("truncated data sub-blocks")
+
+
+def _standalone_frame(color_table: bytes, packed: int, width: int, height: int,
+                      transparent_index: Optional[int], image_data: bytes) -> bytes:
+    """Wrap one frame's LZW data as a complete GIF whose screen is exactly the frame."""
+    size_bits = (len(color_table) // 3).bit_length() - 2
+    header = b"GIF89a" + struct.pack("<HHBBB", width, height, 0x80 | 0x70 | size_bits, 0, 0)
+    gce = b""
+    if transparent_index is not None:
+        gce = b"\x21\xf9\x04" + struct.pack("<BHB", 0x01, 0, transparent_index) + b"\x00"
+    # Keep only the interlace flag; the colour table has moved into the header.
+    descriptor = b"\x2c" + struct.pack("<HHHHB", 0, 0, width, height, packed & 0x40)
+    return header + color_table + gce + descriptor + image_data + b"\x3b"
+
+
+def parse_gif(data: bytes) -> GifInfo:
+    """Walk the GIF once and return its frames and timing."""
+    if data[:6] not in (b"GIF87a", b"GIF89a"):
+        raise GifError("not a GIF file")
+    _need(data, 6, 7, "logical screen descriptor")
+
+    width, height, packed, _bg, _aspect = struct.unpack_from("<HHBBB", data, 6)
+    pos = 13
+    global_table = b""
+    if packed & 0x80:
+        size = _color_table_size(packed)
+        _need(data, pos, size, "global colour table")
+        global_table = data[pos:pos + size]
+        pos += size
+    info = GifInfo(width, height)
+
+    # Graphic Control Extension values apply to the next image only.
+    delay_ms, disposal, transparent = DEFAULT_DELAY_MS, DISPOSE_NONE, None
+
+    n = len(data)
+    while pos < n:
+        block = data[pos]
+        if block == 0x3B:  # trailer
+            break
+
+        if block == 0x21:  # extension
+            _need(data, pos, 2, "extension")
+            label = data[pos + 1]
+            start = pos + 2
+            pos = _skip_sub_blocks(data, start)
+            # _skip_sub_blocks checked that each sub-block (size byte + contents) is present
+            if label == 0xF9 and data[start] >= 4:
+                gce_packed, delay_cs, t_index = struct.unpack_from("<BHB", data, start + 1)
+                delay_ms = delay_cs * 10 if delay_cs * 10 >= MIN_DELAY_MS else DEFAULT_DELAY_MS
+                disposal = (gce_packed >> 2) & 0x07
+                transparent = t_index if gce_packed & 0x01 else None
+            elif label == 0xFF and data[start:start + 12] == b"\x0bNETSCAPE2.0" and data[start + 12] >= 3:
+                info.loop_count = struct.unpack_from("<H", data, start + 14)[0]
+            continue
+
+        if block == 0x2C:  # image descriptor
+            _need(data, pos, 10, "image descriptor")
+            left, top, w, h, img_packed = struct.unpack_from("<HHHHB", data, pos + 1)
+            pos += 10
+            table = global_table
+            if img_packed & 0x80:
+                size = _color_table_size(img_packed)
+                _need(data, pos, size, "local colour table")
+                table = data[pos:pos + size]
+                pos += size
+            if not table:
+                raise GifError("frame has no colour table")
+            start = pos
+            _need(data, pos, 1, "image data")
+            pos = _skip_sub_blocks(data, pos + 1)  # +1: LZW minimum code size byte
+            info.frames.append(GifFrame(
+                left, top, w, h, delay_ms, disposal, transparent,
+                _standalone_frame(table, img_packed, w, h, transparent, data[start:pos]),
+            ))
+            delay_ms, disposal, transparent = DEFAULT_DELAY_MS, DISPOSE_NONE, None
+            continue
+
+        raise GifError(f"unexpected block 0x{block:02x} at offset {pos}")
+
+    if not info.frames:
+        raise GifError("GIF has no frames")
+    return info
+
+
+def read_gif(path: str) -> GifInfo:
+    """Read and parse a GIF file in one go."""
+    with open(path, "rb") as f:
+        return parse_gif(f.read())
@@ -7,21 +7,28 @@ Spencer's Work Timer class.
 
 What you get:
 - UserProfile dataclass persisted to ~/.touch_grass_profile.json
+  (write-behind: rapid saves coalesce into one atomic write)
 - ProfileWindow: a separate 500x600 window to edit name/focus/break and view XP
 - attach_profile(...): adds a small top-right dark panel in Work Timer
   (matches Profile window theme) and shows "Lvl N"
 - open_profile_window(...): opens/raises a single Profile window near the panel
 - grant_xp(...), level_info(...): tiny XP/level helpers
-- Plays small GIFs for some actions (see assets below)
+- Plays small GIFs for some actions (see assets below), at each frame's own delay
 """
 
 from __future__ import annotations
 from dataclasses import dataclass, asdict
-from typing import Optional, List
-import json, os
+from typing import Optional, List, Iterable, NamedTuple
+import atexit, base64, json, math, os, tempfile, threading, time
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import messagebox, filedialog
 
+from Profile import gif_reader
+from Profile.thumbnails import thumbnail_cache
+from Diagnostics.startup_trace import tracer
+from Animation.frame_clock import frame_clock
+
 # ----------------------------- theme -----------------------------------------
 PROFILE_BG      = "#2E3440"   # dark background (Profile window + panel)
 PROFILE_FG      = "#E5E9F0"   # primary text
@@ -43,10 +50,22 @@ DRINK_GIF = os.path.join(ASSETS_DIR, "drink_water.gif")
 TEETH_GIF = os.path.join(ASSETS_DIR, "brush_teeth.gif")
 WALK_GIF  = os.path.join(ASSETS_DIR, "walking.gif")
 
+ACTION_CLIPS = {
+    "water_break":   DRINK_GIF,
+    "brush_teeth":   TEETH_GIF,
+    "outdoor_break": WALK_GIF,
+}
+
+GIF_CACHE_BUDGET = 32 * 1024 * 1024  # bytes of decoded GIF frames kept across windows
+
 # ----------------------------- storage ---------------------------------------
 
 PROFILE_PATH = os.path.join(os.path.expanduser("~"), ".touch_grass_profile.json")
 
+PROFILE_SAVE_DELAY = 0.5     # seconds of quiet before a dirty profile is written
+PROFILE_SAVE_MAX_DELAY = 5.0 # ...but never hold a dirty profile longer than this
+PROFILE_FSYNC = "file"       # "none", "file" (fsync the data) or "full" (file + directory)
+
 
 @dataclass
 class UserProfile:
@@ -58,14 +77,113 @@ class UserProfile:
     avatar_path: Optional[str] = None  # file path to chosen image (optional)
 
 
+def _atomic_write_json(path: str, data: dict, fsync: str) -> None:
+    """Write JSON to a temp file next to `path`, then rename it into place."""
+    folder = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=".touch_grass_profile.", suffix=".tmp", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            if fsync != "none":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)  # atomic: readers see the old file or the new one, never half of one
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    if fsync == "full" and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class ProfileStore:
+    """
+    Write-behind persistence for the profile. Only the latest dirty state is kept;
+    it is written after `delay` seconds without another save (at most `max_delay`
+    after it first became dirty) and at interpreter exit.
+
+    save() only swaps in the new state and moves the deadline of one long-lived
+    writer thread, so the Tk thread never waits on the disk. Writes happen outside
+    the state lock, one at a time, in the order their states were taken.
+    """
+    def __init__(self, delay: float = PROFILE_SAVE_DELAY, max_delay: float = PROFILE_SAVE_MAX_DELAY,
+                 fsync: str = PROFILE_FSYNC):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.fsync = fsync
+        self.writes = 0  # completed disk writes, handy for checking coalescing
+        self._cond = threading.Condition()      # guards _pending/_dirty_since/_deadline
+        self._write_lock = threading.Lock()     # one disk write at a time, in order
+        self._pending: Optional[dict] = None
+        self._dirty_since = 0.0
+        self._deadline: Optional[float] = None  # monotonic time the writer should flush at
+        self._writer: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+
+    def save(self, p: UserProfile) -> None:
+        """Mark `p` as the state to persist and push back the write deadline."""
+        data = asdict(p)
+        with self._cond:
+            now = time.monotonic()
+            if self._pending is None:
+                self._dirty_since = now
+            self._pending = data
+            self._deadline = min(now + self.delay, self._dirty_since + self.max_delay)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="profile-writer", daemon=True)
+                self._writer.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._deadline is None or time.monotonic() < self._deadline:
+                    self._cond.wait(None if self._deadline is None else self._deadline - time.monotonic())
+            self.flush()
+
+    def pending(self) -> Optional[dict]:
+        """The unsaved state, if any (so reads see the latest save)."""
+        with self._cond:
+            return None if self._pending is None else dict(self._pending)
+
+    def flush(self) -> None:
+        """Write any pending state now."""
+        with self._write_lock:
+            with self._cond:
+                data, self._pending = self._pending, None
+                self._deadline = None
+            if data is None:
+                return
+            try:
+                _atomic_write_json(PROFILE_PATH, data, self.fsync)
+                self.writes += 1
+            except OSError as e:
+                print(f"Could not save profile: {e}")
+                with self._cond:
+                    if self._pending is None:
+                        self._pending = data  # retried on the next save/flush
+
+
+profile_store = ProfileStore()
+
+
 def load_profile() -> UserProfile:
     """Load profile from disk, or create/reset to defaults if missing/corrupted."""
+    pending = profile_store.pending()
+    if pending is not None:
+        return UserProfile(**pending)
     if not os.path.exists(PROFILE_PATH):
         p = UserProfile()
         save_profile(p)
         return p
     try:
-        with open(PROFILE_PATH, "r", encoding="utf-8") as f:
+        with tracer.span("load profile JSON", "io"), open(PROFILE_PATH, "r", encoding="utf-8") as f:
             data = json.load(f)
         return UserProfile(**data)  # default any missing keys
     except Exception:
@@ -75,9 +193,13 @@ def load_profile() -> UserProfile:
 
 
 def save_profile(p: UserProfile) -> None:
-    """Write the current profile to disk (human-readable JSON)."""
-    with open(PROFILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(asdict(p), f, indent=2)
+    """Queue the current profile for writing (human-readable JSON); see ProfileStore."""
+    profile_store.save(p)
+
+
+def flush_profile() -> None:
+    """Write any queued profile changes to disk immediately."""
+    profile_store.flush()
 
 # ---------------------------- XP helpers -------------------------------------
 
@@ -101,17 +223,33 @@ def level_info(xp: int) -> tuple[int, int, int, int]:
     """
     Translate total XP into: (level, into_level, needed_this_level, remaining_to_next).
     Example: if BASE_LEVEL_XP=500 and xp=750 -> level 2, into=250, need=1000, remaining=750.
+
+    Reaching level L takes BASE_LEVEL_XP * (1 + 2 + ... + L-1) = BASE_LEVEL_XP * T(L-1) XP in
+    total, so the level is found in O(1) by inverting the triangular number T(m) = m(m+1)/2.
     """
-    lvl = 1
-    rem = xp
+    # Whole "units" of BASE_LEVEL_XP; the thresholds are multiples of it, so this is exact.
+    units = max(0, int(xp // BASE_LEVEL_XP))
+    m = (math.isqrt(8 * units + 1) - 1) // 2  # largest m with T(m) <= units
+    lvl = m + 1
+    rem = xp - BASE_LEVEL_XP * (m * (m + 1) // 2)
     need = BASE_LEVEL_XP * lvl
-    while rem >= need:
-        rem -= need
-        lvl += 1
-        need = BASE_LEVEL_XP * lvl
     return lvl, rem, need, (need - rem)
 
 
+def level_info_batch(xps: Iterable[int]) -> List[tuple[int, int, int, int]]:
+    """level_info for many XP values in one pass (e.g. a whole leaderboard page)."""
+    base = BASE_LEVEL_XP
+    isqrt = math.isqrt
+    out = []
+    append = out.append
+    for xp in xps:
+        m = (isqrt(8 * max(0, int(xp // base)) + 1) - 1) // 2
+        rem = xp - base * (m * (m + 1) // 2)
+        need = base * (m + 1)
+        append((m + 1, rem, need, need - rem))
+    return out
+
+
 def grant_xp(prof: UserProfile, action: str, units: int = 1) -> int:
     """Increment XP for an action and persist it. Returns XP gained for UI feedback."""
     base = ACTION_XP.get(action, 0)
@@ -132,6 +270,8 @@ def _apply_to_app(app, prof: UserProfile) -> bool:
     if hasattr(app, "work_time"):
         app.work_time = prof.focus_min * 60
         changed = True
+    if hasattr(app, "original_work_time"):
+        app.original_work_time = prof.focus_min * 60  # what reset_timer goes back to
     if hasattr(app, "break_time"):
         app.break_time = prof.break_min * 60
         changed = True
@@ -152,6 +292,111 @@ def _apply_to_app(app, prof: UserProfile) -> bool:
                 pass
     return changed
 
+# ------------------------------ GIF frame cache ------------------------------
+
+class GifClip(NamedTuple):
+    frames: List[tk.PhotoImage]
+    delays: List[int]  # milliseconds each frame stays on screen
+
+
+def _copy_outside(src: tk.PhotoImage, dst: tk.PhotoImage, x0: int, y0: int, x1: int, y1: int) -> None:
+    """Copy `src` into blank `dst` except for the rectangle (x0, y0)-(x1, y1)."""
+    W, H = src.width(), src.height()
+    for fx0, fy0, fx1, fy1 in ((0, 0, W, y0), (0, y1, W, H), (0, y0, x0, y1), (x1, y0, W, y1)):
+        if fx1 > fx0 and fy1 > fy0:
+            dst.tk.call(dst, "copy", src, "-from", fx0, fy0, fx1, fy1, "-to", fx0, fy0)
+
+
+def _decode_gif_frames(path: str, max_side: int) -> Optional[GifClip]:
+    """
+    Decode every frame of a GIF and shrink it to fit `max_side`. Works without Pillow:
+    gif_reader walks the file once, Tk decodes each frame's pixels, and frames are
+    composited onto the logical screen following their disposal methods.
+    """
+    try:
+        info = gif_reader.read_gif(path)
+    except (OSError, gif_reader.GifError):
+        return None
+
+    fx, fy = max(1, info.width // max_side), max(1, info.height // max_side)
+    screen = tk.PhotoImage(width=info.width, height=info.height)
+    frames: List[tk.PhotoImage] = []
+    delays: List[int] = []
+    try:
+        for frame in info.frames:
+            piece = tk.PhotoImage(data=base64.b64encode(frame.data).decode("ascii"), format="gif")
+            saved = None
+            if frame.disposal == gif_reader.DISPOSE_PREVIOUS:
+                saved = screen.copy()
+            screen.tk.call(screen, "copy", piece, "-to", frame.left, frame.top)  # overlay keeps transparency
+
+            frames.append(screen.subsample(fx, fy) if fx > 1 or fy > 1 else screen.copy())
+            delays.append(frame.delay_ms)
+
+            if frame.disposal == gif_reader.DISPOSE_BACKGROUND:
+                cleared = tk.PhotoImage(width=info.width, height=info.height)
+                _copy_outside(screen, cleared, frame.left, frame.top,
+                              frame.left + frame.width, frame.top + frame.height)
+                screen = cleared
+            elif saved is not None:
+                screen = saved
+    except tk.TclError:
+        pass  # keep the frames decoded so far
+    return GifClip(frames, delays) if frames else None
+
+
+class GifFrameCache:
+    """
+    Process-wide LRU of decoded GIF frames keyed by (path, mtime, max_side), so
+    replaying a clip costs no decoding. Entries are evicted least-recently-used
+    once the decoded frames exceed `budget` bytes (estimated at 4 bytes/pixel).
+    PhotoImages belong to the Tk thread, so this must only be used from it.
+    """
+    def __init__(self, budget: int = GIF_CACHE_BUDGET):
+        self.budget = budget
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (clip, size in bytes)
+
+    def get(self, path: str, max_side: int = 150) -> Optional[GifClip]:
+        try:
+            key = (os.path.abspath(path), os.stat(path).st_mtime_ns, max_side)
+        except OSError:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        clip = _decode_gif_frames(path, max_side)
+        if clip:
+            size = sum(f.width() * f.height() * 4 for f in clip.frames)
+            self._entries[key] = (clip, size)
+            self.bytes += size
+            while self.bytes > self.budget and len(self._entries) > 1:
+                _, (_, old_size) = self._entries.popitem(last=False)
+                self.bytes -= old_size
+        return clip
+
+    def preload(self, widget: tk.Misc, paths, max_side: int = 150) -> None:
+        """Decode `paths` one per idle slot of `widget`'s event loop, without blocking the UI."""
+        queue = [p for p in paths if os.path.exists(p)]
+
+        def _next():
+            if not queue or not widget.winfo_exists():
+                return
+            self.get(queue.pop(0), max_side)
+            widget.after_idle(_next)
+
+        widget.after_idle(_next)
+
+
+gif_frame_cache = GifFrameCache()
+
 # ------------------------------ Profile window -------------------------------
 
 class ProfileWindow(tk.Toplevel):
@@ -178,7 +423,8 @@ class ProfileWindow(tk.Toplevel):
         self.transient(master)  # sit on top of Main
 
         # animation state for action GIFs
-        self._anim_after_id: Optional[str] = None
+        self._anim_task = None  # FrameTask while an action GIF plays
+        self._anim_item: Optional[int] = None
         self._anim_frames: Optional[List[tk.PhotoImage]] = None
         self._anim_index: int = 0
         self._anim_cycles_left: int = 0
@@ -246,6 +492,9 @@ class ProfileWindow(tk.Toplevel):
         self._draw_avatar()
         self._refresh_xp()
 
+        # Decode the action clips while the window is idle so the first click plays instantly
+        gif_frame_cache.preload(self, ACTION_CLIPS.values())
+
         # ESC key closes the window (nice UX)
         self.bind("<Escape>", lambda e: self.destroy())
 
@@ -282,23 +531,19 @@ class ProfileWindow(tk.Toplevel):
             self.on_change(self.prof)
 
     def _draw_avatar(self) -> None:
-        """Render the chosen image into a 150x150 box; no external deps needed."""
+        """Render the chosen image into a 150x150 box from the thumbnail cache; no external deps needed."""
         c = self.avatar_canvas
         c.delete("all")
         self._stop_anim()
 
         if self.prof.avatar_path and os.path.exists(self.prof.avatar_path):
-            try:
-                self.avatar_img = tk.PhotoImage(file=self.prof.avatar_path)
-                w, h = self.avatar_img.width(), self.avatar_img.height()
-                fx = max(1, w // 150)
-                fy = max(1, h // 150)
-                if fx > 1 or fy > 1:
-                    self.avatar_img = self.avatar_img.subsample(fx, fy)
+            img = thumbnail_cache.photo(self.prof.avatar_path, 150)
+            if img is not None:
+                self.avatar_img = img
                 c.create_image(75, 75, image=self.avatar_img)
                 return
-            except Exception:
-                pass
+            # Not cached yet: show the placeholder and repaint once the thumbnail exists
+            thumbnail_cache.ensure(self, self.prof.avatar_path, self._redraw_avatar_if_idle)
 
         # Placeholder avatar (simple, consistent with theme)
         c.create_oval(45, 25, 105, 85, fill=PROFILE_FG, outline="#D8DEE9", width=2)   # head
@@ -307,57 +552,55 @@ class ProfileWindow(tk.Toplevel):
         c.create_line(75, 85, 75, 120, fill=PROFILE_FG, width=6)                      # neck
         c.create_line(55, 120, 95, 120, fill=PROFILE_FG, width=12)                    # shoulders
 
-    def _load_gif_frames(self, path: str, max_side: int = 150) -> Optional[List[tk.PhotoImage]]:
-        """Return frames for a GIF (or None). Works without Pillow; Tk handles GIF."""
-        if not os.path.exists(path):
-            return None
-        frames: List[tk.PhotoImage] = []
-        ix = 0
-        try:
-            while True:
-                frm = tk.PhotoImage(file=path, format=f"gif -index {ix}")
-                w, h = frm.width(), frm.height()
-                fx, fy = max(1, w // max_side), max(1, h // max_side)
-                if fx > 1 or fy > 1:
-                    frm = frm.subsample(fx, fy)
-                frames.append(frm)
-                ix += 1
-        except Exception:
-            pass
-        return frames or None
+    def _redraw_avatar_if_idle(self) -> None:
+        """Thumbnail-ready callback: repaint unless an action GIF is playing."""
+        if self._anim_frames is None:
+            self._draw_avatar()
+
+    def _load_gif_clip(self, path: str, max_side: int = 150) -> Optional[GifClip]:
+        """Return frames + delays for a GIF (or None), decoded once per process; see GifFrameCache."""
+        return gif_frame_cache.get(path, max_side)
 
-    def _play_anim(self, frames: List[tk.PhotoImage], cycles: int = 1, delay_ms: int = 60) -> None:
-        """Play frames in the avatar canvas for a few cycles."""
+    def _play_anim(self, frames: List[tk.PhotoImage], cycles: int = 1, delay_ms: int = 60,
+                   delays: Optional[List[int]] = None) -> None:
+        """Play frames in the avatar canvas for a few cycles, using per-frame `delays` when given.
+        Runs on the shared frame clock and swaps the image of one canvas item per frame."""
         self._stop_anim()
+        if not frames:
+            return
         self._anim_frames = frames
         self._anim_index = 0
         self._anim_cycles_left = max(1, cycles)
+        self.avatar_canvas.delete("all")
+        self._anim_item = self.avatar_canvas.create_image(75, 75, image=frames[0])
 
-        def _tick():
-            if not self._anim_frames:
-                return
-            frm = self._anim_frames[self._anim_index]
-            self.avatar_canvas.delete("all")
-            self.avatar_canvas.create_image(75, 75, image=frm)
+        def _advance() -> None:
             self._anim_index += 1
             if self._anim_index >= len(self._anim_frames):
                 self._anim_index = 0
                 self._anim_cycles_left -= 1
-                if self._anim_cycles_left <= 0:
-                    self._stop_anim()
-                    self._draw_avatar()  # restore still image
-                    return
-            self._anim_after_id = self.after(delay_ms, _tick)
 
-        _tick()
+        def _tick(steps: int) -> None:
+            if not self._anim_frames:
+                return
+            for _ in range(steps - 1):  # frames the clock dropped while we were behind
+                _advance()
+            if self._anim_cycles_left <= 0:
+                self._stop_anim()
+                self._draw_avatar()  # restore still image once the last frame has had its time
+                return
+            shown = self._anim_index
+            self.avatar_canvas.itemconfig(self._anim_item, image=self._anim_frames[shown])
+            _advance()
+            self._anim_task.interval_ms = delays[shown] if delays else delay_ms
+
+        self._anim_task = frame_clock(self).every(delays[0] if delays else delay_ms, _tick, widget=self)
 
     def _stop_anim(self) -> None:
-        if self._anim_after_id:
-            try:
-                self.after_cancel(self._anim_after_id)
-            except Exception:
-                pass
-        self._anim_after_id = None
+        if self._anim_task is not None:
+            self._anim_task.cancel()
+        self._anim_task = None
+        self._anim_item = None
         self._anim_frames = None
         self._anim_index = 0
         self._anim_cycles_left = 0
@@ -387,18 +630,11 @@ class ProfileWindow(tk.Toplevel):
             self.on_change(self.prof)
 
         # Pick a clip for this action (if present)
-        clip = None
-        if action == "water_break":
-            clip = DRINK_GIF
-        elif action == "brush_teeth":
-            clip = TEETH_GIF
-        elif action == "outdoor_break":
-            clip = WALK_GIF
-
+        clip = ACTION_CLIPS.get(action)
         if clip and os.path.exists(clip):
-            frames = self._load_gif_frames(clip)
-            if frames:
-                self._play_anim(frames, cycles=2, delay_ms=65)
+            gif = self._load_gif_clip(clip)
+            if gif:
+                self._play_anim(gif.frames, cycles=2, delays=gif.delays)
 
         messagebox.showinfo("XP", f"+{gained} XP ({action.replace('_',' ').title()})", parent=self)
 
@@ -512,17 +748,12 @@ def attach_profile(root: tk.Tk, app, title_prefix: str = "Posture Pomodoro Timer
         nonlocal thumb_img
         thumb_canvas.delete("all")
         if p.avatar_path and os.path.exists(p.avatar_path):
-            try:
-                img = tk.PhotoImage(file=p.avatar_path)
-                w, h = img.width(), img.height()
-                fx = max(1, w // 28); fy = max(1, h // 28)
-                if fx > 1 or fy > 1:
-                    img = img.subsample(fx, fy)
+            img = thumbnail_cache.photo(p.avatar_path, 28)
+            if img is not None:
                 thumb_img = img
                 thumb_canvas.create_image(14, 14, image=thumb_img)
                 return
-            except Exception:
-                pass
+            thumbnail_cache.ensure(thumb_canvas, p.avatar_path, lambda: _refresh_thumb(p))
         # fallback placeholder
         thumb_canvas.create_oval(4, 4, 24, 24, outline=PANEL_STROKE)
 
@@ -0,0 +1,157 @@
+# Profile/thumbnails.py
+"""
+Avatar thumbnails
+-----------------
+The avatar can be any picture the user picks (possibly several megapixels),
+but we only ever show it at 150px (Profile window) and 28px (panel). This module
+decodes the original once, writes properly resampled versions into a
+content-hashed cache folder, and hands repaints a small PhotoImage from there.
+
+- Hashing, decoding and resampling run on a background thread with Pillow
+  (in requirements.txt): LANCZOS resampling, any format Pillow reads, incl. JPEG.
+- Only if Pillow is missing (or can't read the file) does the Tk thread decode
+  the original once and write integer subsampled thumbnails, so later repaints
+  are still cheap.
+- Cache files are named <sha1 of content>_<size>.png, so the same picture chosen
+  from two places is stored once and an edited file gets fresh thumbnails.
+- Decoded thumbnails are held by the shared asset registry (Assets/registry.py).
+"""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import math, os, tempfile
+import tkinter as tk
+
+from Assets.registry import asset_registry, content_hash
+
+try:
+    from PIL import Image
+except ImportError:  # listed in requirements.txt; without it Tk handles PNG/GIF on the main thread
+    Image = None
+
+THUMB_DIR   = os.path.join(os.path.expanduser("~"), ".touch_grass_thumbs")
+THUMB_SIZES = (150, 28)
+POLL_MS     = 30
+
+
+def _replace_into(final_path: str, write: Callable[[str], None]) -> None:
+    """Call write(tmp_path) then atomically move the result to `final_path`."""
+    fd, tmp = tempfile.mkstemp(suffix=".png", dir=os.path.dirname(final_path))
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, final_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ThumbnailCache:
+    """Content-hashed on-disk thumbnails, decoded through the asset registry."""
+
+    def __init__(self, folder: str = THUMB_DIR, sizes: Tuple[int, ...] = THUMB_SIZES):
+        self.folder = folder
+        self.sizes = sizes
+        self._digests: Dict[tuple, str] = {}       # (abspath, mtime_ns, file size) -> content hash
+        self._failed: set = set()                  # stat keys we could not decode
+        self._pending: Dict[tuple, List[Tuple[tk.Misc, Callable[[], None]]]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbs")
+
+    # ---- lookups (Tk thread, never decode the original) ----
+
+    def _stat_key(self, path: str) -> Optional[tuple]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+    def thumb_path(self, digest: str, size: int) -> str:
+        return os.path.join(self.folder, f"{digest}_{size}.png")
+
+    def photo(self, path: str, size: int) -> Optional[tk.PhotoImage]:
+        """The cached `size` thumbnail of `path` as a PhotoImage, or None if it isn't ready yet."""
+        key = self._stat_key(path)
+        digest = self._digests.get(key) if key else None
+        if digest is None:
+            return None
+        try:
+            return asset_registry.image(self.thumb_path(digest, size))
+        except (OSError, tk.TclError):
+            return None
+
+    # ---- generation ----
+
+    def _missing(self, digest: str) -> List[int]:
+        return [s for s in self.sizes if not os.path.exists(self.thumb_path(digest, s))]
+
+    def _prepare(self, path: str) -> Tuple[str, List[int]]:
+        """Worker thread: hash the file and render what we can; returns sizes still missing."""
+        os.makedirs(self.folder, exist_ok=True)
+        digest = content_hash(path)
+        missing = self._missing(digest)
+        if missing and Image is not None:
+            try:
+                with Image.open(path) as src:
+                    src.draft("RGB", (max(missing), max(missing)))  # lets JPEG decode at reduced size
+                    src = src.convert("RGBA")
+                    for size in missing:
+                        thumb = src.copy()
+                        thumb.thumbnail((size, size), Image.LANCZOS, reducing_gap=3.0)
+                        _replace_into(self.thumb_path(digest, size), lambda tmp: thumb.save(tmp, "PNG"))
+                missing = []
+            except Exception:
+                pass  # fall back to Tk on the main thread
+        return digest, missing
+
+    def _render_with_tk(self, path: str, digest: str, sizes: List[int]) -> None:
+        """Tk thread fallback (no Pillow): decode once, subsample to fit, write PNGs."""
+        src = tk.PhotoImage(file=path)
+        w, h = src.width(), src.height()
+        for size in sizes:
+            factor = max(1, math.ceil(max(w, h) / size))
+            small = src.subsample(factor, factor) if factor > 1 else src
+            _replace_into(self.thumb_path(digest, size), lambda tmp: small.write(tmp, format="png"))
+
+    def ensure(self, widget: tk.Misc, path: str, on_ready: Callable[[], None]) -> None:
+        """Make sure thumbnails of `path` exist; call on_ready() on the Tk thread once they do."""
+        key = self._stat_key(path)
+        if key is None or key in self._failed:
+            return
+        if key in self._digests and not self._missing(self._digests[key]):
+            return
+        waiting = self._pending.get(key)
+        if waiting is not None:
+            waiting.append((widget, on_ready))
+            return
+        self._pending[key] = [(widget, on_ready)]
+        future = self._executor.submit(self._prepare, path)
+        # Poll on the root: if `widget` (e.g. the Profile window) closes first, its after()
+        # callbacks are dropped and the key would stay pending with nobody to finish it.
+        root = widget._root()
+        root.after(POLL_MS, self._poll, root, key, path, future)
+
+    def _poll(self, root: tk.Misc, key: tuple, path: str, future: Future) -> None:
+        if not future.done():
+            root.after(POLL_MS, self._poll, root, key, path, future)
+            return
+        waiting = self._pending.pop(key, [])
+        try:
+            digest, missing = future.result()
+            if missing:
+                self._render_with_tk(path, digest, missing)
+        except Exception as e:
+            print(f"Could not make thumbnails for {path}: {e}")
+            self._failed.add(key)
+            return
+        self._digests[key] = digest
+        for w, callback in waiting:
+            if w.winfo_exists():  # skip waiters whose window closed meanwhile
+                callback()
+
+
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,325 @@
+# activity.py
+"""
+Per-second timer/posture trace with minute and hour tiers.
+
+Each tier is a fixed-size ring of slots, one slot per second / minute / hour of
+wall-clock time (slot = timestamp // step, position = slot % capacity), stored as
+a few typed columns inside one memory-mapped file. Nothing grows while the app
+runs: a day of seconds, a week of minutes and a year of hours take ~420 KB in
+total on disk and in memory, and old slots are simply overwritten.
+
+The seconds tier stores one state byte (has data / running / working / posture
+stage) and the seconds left on the timer. The minute and hour tiers are updated
+from each second as it is recorded, so they are always current: how many seconds
+had data, were running, were work time, and the sum of posture stages over the
+work seconds (mean posture = posture_sum / working).
+
+The timer only ticks every second while its page is visible, so gaps since the
+previous sample are filled with that sample's state (the remaining time keeps
+counting down while running), in bulk slice writes. Gaps longer than
+MAX_FILL_SECONDS, and time before this process's first sample, stay empty.
+
+Each summary tier's header records the newest second folded into it, so a second
+recorded again (a state change within the same second, possibly by the previous
+run of the app) replaces its old contribution instead of being counted twice.
+"""
+import atexit
+import mmap
+import os
+import struct
+import time
+from array import array
+
+ACTIVITY_DIR = os.path.join(os.path.expanduser("~"), ".touch_grass_activity")
+MAX_FILL_SECONDS = 6 * 3600
+FLUSH_EVERY = 60  # samples between msync()s
+
+# magic, step, capacity, newest slot written, newest second summarised into this tier (-1 if none)
+HEADER = struct.Struct("<4sIIqq")
+SUMMARISED = struct.Struct("<q")  # just the last header field, rewritten on every sample
+MAGIC = b"TGA2"
+
+SECOND_COLUMNS = (("state", "B"), ("remaining", "H"))
+SUMMARY_COLUMNS = (("samples", "H"), ("running", "H"), ("working", "H"), ("posture_sum", "H"))
+
+# name: (seconds per slot, slots kept, columns)
+TIERS = {
+    "seconds": (1, 24 * 3600, SECOND_COLUMNS),
+    "minutes": (60, 7 * 24 * 60, SUMMARY_COLUMNS),
+    "hours": (3600, 366 * 24, SUMMARY_COLUMNS),
+}
+SUMMARY_TIERS = ("minutes", "hours")
+
+HAS_DATA, RUNNING, WORKING = 1, 2, 4
+
+
+def encode_state(running, working, posture):
+    return HAS_DATA | (RUNNING if running else 0) | (WORKING if working else 0) | (posture << 3)
+
+
+def decode_state(state):
+    """(running, working, posture), or None for an empty slot."""
+    if not state & HAS_DATA:
+        return None
+    return bool(state & RUNNING), bool(state & WORKING), state >> 3
+
+
+class Tier:
+    """A ring of `capacity` slots with typed columns, in an mmap'd file (or in memory if path is None)."""
+
+    def __init__(self, path, step, capacity, columns):
+        self.step = step
+        self.capacity = capacity
+        self.names = [name for name, _ in columns]
+        self.codes = dict(columns)
+        size = HEADER.size + sum(capacity * array(code).itemsize for _, code in columns)
+
+        self.map = None
+        if path is None:
+            self.buffer = bytearray(size)
+            self.newest = self.summarised = -1
+        else:
+            self.buffer = self.map = self._open(path, size, step, capacity)
+            self.newest, self.summarised = HEADER.unpack_from(self.map)[3:]
+
+        self.columns = {}
+        offset = HEADER.size
+        view = memoryview(self.buffer)
+        for name, code in columns:
+            length = capacity * array(code).itemsize
+            self.columns[name] = view[offset:offset + length].cast(code)
+            offset += length
+
+    @staticmethod
+    def _open(path, size, step, capacity):
+        fresh = not os.path.exists(path) or os.path.getsize(path) != size
+        if fresh:
+            with open(path, "wb") as f:
+                f.truncate(size)
+        with open(path, "r+b") as f:
+            mapped = mmap.mmap(f.fileno(), size)
+        magic, old_step, old_capacity = HEADER.unpack_from(mapped)[:3]
+        if fresh or magic != MAGIC or (old_step, old_capacity) != (step, capacity):
+            mapped[:] = bytes(size)
+            HEADER.pack_into(mapped, 0, MAGIC, step, capacity, -1, -1)
+        return mapped
+
+    def _store_header(self):
+        if self.map is not None:
+            HEADER.pack_into(self.map, 0, MAGIC, self.step, self.capacity, self.newest, self.summarised)
+
+    def slot(self, timestamp):
+        return int(timestamp // self.step)
+
+    def advance_to(self, slot):
+        """Make `slot` the newest, emptying every slot skipped on the way (at most one lap)."""
+        if slot <= self.newest:
+            return
+        if slot == self.newest + 1:
+            pos = slot % self.capacity
+            for column in self.columns.values():
+                column[pos] = 0
+        else:
+            first = max(self.newest + 1, slot - self.capacity + 1)
+            for name, code in self.codes.items():
+                self.put(name, first, array(code, bytes((slot + 1 - first) * array(code).itemsize)))
+        self.newest = slot
+        self._store_header()
+
+    def put(self, name, first, values):
+        """Slice-write an array of values into column `name` from slot `first` on, wrapping
+        around the end of the ring. Doesn't move `newest`; call advance_to first."""
+        column = self.columns[name]
+        pos = first % self.capacity
+        head = min(len(values), self.capacity - pos)
+        column[pos:pos + head] = values[:head]
+        if head < len(values):
+            column[:len(values) - head] = values[head:]
+
+    def mark_summarised(self, second):
+        if second > self.summarised:
+            self.summarised = second
+            if self.map is not None:
+                SUMMARISED.pack_into(self.map, HEADER.size - SUMMARISED.size, second)
+
+    def holds(self, slot):
+        return self.newest - self.capacity < slot <= self.newest
+
+    def get(self, slot):
+        """{column: value} for `slot`, or None if it has rolled out of the ring (or never was)."""
+        if not self.holds(slot):
+            return None
+        pos = slot % self.capacity
+        return {name: self.columns[name][pos] for name in self.names}
+
+    def flush(self):
+        if self.map is not None:
+            self.map.flush()
+
+    def close(self):
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+class ActivityRecorder:
+    """Feed record() the timer state (at least) whenever it changes; see the module docstring."""
+
+    def __init__(self, folder=ACTIVITY_DIR, clock=time.time, max_fill=MAX_FILL_SECONDS):
+        self.clock = clock
+        self.max_fill = max_fill
+        if folder is not None:
+            os.makedirs(folder, exist_ok=True)
+        self.tiers = {
+            name: Tier(os.path.join(folder, f"{name}.seg") if folder else None, step, capacity, columns)
+            for name, (step, capacity, columns) in TIERS.items()
+        }
+        self.last = None  # (second slot, state byte, remaining) of this process's newest sample
+        self.unflushed = 0
+        atexit.register(self.close)
+
+    def record(self, running, working, posture, remaining, now=None):
+        second = int(self.clock() if now is None else now)
+        state = encode_state(running, working, posture)
+        remaining = max(0, min(0xFFFF, int(remaining)))
+        seconds = self.tiers["seconds"]
+        if second < seconds.newest:
+            return  # the wall clock went backwards (maybe across a restart); keep the ring ordered
+        if self.last is not None:
+            last_second, last_state, last_remaining = self.last
+            if 1 < second - last_second <= self.max_fill:
+                self._fill(last_second + 1, second - last_second - 1, last_state, last_remaining)
+        if second == seconds.newest:
+            self._unwrite(second)  # a second state change within the same second replaces it
+        self._write(second, state, remaining)
+        self.last = (second, state, remaining)
+
+        self.unflushed += 1
+        if self.unflushed >= FLUSH_EVERY:
+            self.flush()
+
+    def _write(self, second, state, remaining):
+        seconds = self.tiers["seconds"]
+        seconds.advance_to(second)
+        pos = second % seconds.capacity
+        seconds.columns["state"][pos] = state
+        seconds.columns["remaining"][pos] = remaining
+        for name in SUMMARY_TIERS:
+            self._summarise(self.tiers[name], second, 1, state, 1)
+
+    def _fill(self, first, count, state, remaining):
+        """Write `count` seconds of an unchanged state from `first` on, as slices rather than
+        second by second (this runs on the Tk thread when the page reappears)."""
+        seconds = self.tiers["seconds"]
+        seconds.advance_to(first + count - 1)
+        seconds.put("state", first, array("B", bytes((state,))) * count)
+        if state & RUNNING:  # still counting down, stopping at zero
+            left = array("H", range(remaining - 1, max(remaining - 1 - count, -1), -1))
+            left.extend(array("H", bytes(2 * (count - len(left)))))
+        else:
+            left = array("H", (remaining,)) * count
+        seconds.put("remaining", first, left)
+        for name in SUMMARY_TIERS:
+            self._summarise(self.tiers[name], first, count, state, 1)
+
+    def _unwrite(self, second):
+        """Take a second's old sample back out of the summaries it was counted in."""
+        old = self.tiers["seconds"].get(second)
+        if old and old["state"] & HAS_DATA:
+            for name in SUMMARY_TIERS:
+                tier = self.tiers[name]
+                if tier.summarised >= second:
+                    self._summarise(tier, second, 1, old["state"], -1)
+
+    def _summarise(self, tier, first, count, state, sign):
+        """Add (sign -1: remove) `count` seconds of `state` from `first` on to a summary tier,
+        one update per slot they cover."""
+        running, working, posture = decode_state(state)
+        columns = tier.columns
+        step = tier.step
+        end = first + count
+        slot = first // step
+        while slot * step < end:
+            n = sign * (min(end, (slot + 1) * step) - max(first, slot * step))
+            tier.advance_to(slot)
+            pos = slot % tier.capacity
+            columns["samples"][pos] += n
+            if running:
+                columns["running"][pos] += n
+            if working:
+                columns["working"][pos] += n
+                columns["posture_sum"][pos] += n * posture
+            slot += 1
+        if sign > 0:
+            tier.mark_summarised(end - 1)
+
+    def series(self, tier, count, now=None):
+        """The newest `count` slots of a tier as (slot start timestamp, values or None), oldest first.
+        Seconds-tier values are (running, working, posture, remaining)."""
+        t = self.tiers[tier]
+        newest = t.slot(self.clock() if now is None else now)
+        out = []
+        for slot in range(newest - count + 1, newest + 1):
+            values = t.get(slot)
+            if values is not None and tier == "seconds":
+                decoded = decode_state(values["state"])
+                values = None if decoded is None else decoded + (values["remaining"],)
+            elif values is not None and not values["samples"]:
+                values = None
+            out.append((slot * t.step, values))
+        return out
+
+    def flush(self):
+        self.unflushed = 0
+        for tier in self.tiers.values():
+            tier.flush()
+
+    def close(self):
+        if self.tiers:
+            self.flush()
+            for tier in self.tiers.values():
+                tier.close()
+            self.tiers = {}
+
+
+if __name__ == "__main__":
+    # Benchmark: a simulated week of 1 Hz samples into scratch segment files, then one
+    # more day with tracemalloc on to show the Python heap doesn't grow with run time
+    import tempfile
+    import tracemalloc
+
+    def feed(recorder, start, seconds):
+        for i in range(seconds):
+            in_cycle = i % 3300  # 50 min work, 5 min break
+            working = in_cycle < 3000
+            recorder.record(True, working, min(4, in_cycle // 600) if working else 0,
+                            (3000 if working else 3300) - in_cycle, now=start + i)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder = ActivityRecorder(folder=tmp)
+        start, week = 1_700_000_000, 7 * 24 * 3600
+        began = time.perf_counter()
+        feed(recorder, start, week)
+        took = time.perf_counter() - began
+
+        tracemalloc.start()
+        feed(recorder, start + week, 24 * 3600)
+        heap = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        minutes = [v for _, v in recorder.series("minutes", 7 * 24 * 60, now=start + week) if v]
+
+        # The page comes back after 6 hours hidden: one call fills 21600 seconds
+        recorder.record(True, True, 1, 3000, now=start + week + 24 * 3600)
+        began = time.perf_counter()
+        recorder.record(True, True, 1, 3000, now=start + week + 30 * 3600)
+        fill_ms = (time.perf_counter() - began) * 1000
+
+        sizes = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+        print(f"a week of samples in {took:.1f} s ({took / week * 1e6:.1f} us each); segment files "
+              f"{sizes / 1024:.0f} KB; peak Python heap over another day {heap / 1024:.0f} KB; "
+              f"{len(minutes)} minutes summarised; 6 h gap filled in {fill_ms:.1f} ms")
+        recorder.close()
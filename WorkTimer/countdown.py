@@ -0,0 +1,148 @@
+# countdown.py
+import math
+import time
+
+
+class Countdown:
+    """Time left until an absolute deadline on a monotonic clock.
+
+    Nothing is subtracted tick by tick, so late or missed ticks never add up to
+    drift, and wall-clock changes don't move the deadline. Each tick asks for the
+    delay to the next whole-second boundary of the remaining time, so the display
+    flips exactly when a second actually ends.
+    """
+
+    # A tick this much later than requested (or a wall/monotonic mismatch this big)
+    # is reported as a gap: the machine slept, or the Tk loop was blocked.
+    GAP_THRESHOLD = 2.0
+
+    def __init__(self, seconds, clock=time.monotonic, wall_clock=time.time):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._remaining = float(seconds)
+        self._deadline = None
+        self._expected_tick = None
+        self._last_mono = None
+        self._last_wall = None
+
+    @property
+    def running(self):
+        return self._deadline is not None
+
+    def remaining(self):
+        if self._deadline is None:
+            return self._remaining
+        return max(0.0, self._deadline - self.clock())
+
+    def overshoot(self):
+        """Seconds since the deadline passed (0 if it hasn't, or while paused)."""
+        if self._deadline is None:
+            return 0.0
+        return max(0.0, self.clock() - self._deadline)
+
+    def start(self):
+        if self._deadline is None:
+            self._deadline = self.clock() + self._remaining
+            self._mark()
+
+    def pause(self):
+        if self._deadline is not None:
+            self._remaining = self.remaining()
+            self._deadline = None
+            self._expected_tick = None
+
+    def set(self, seconds):
+        """Set the time left, keeping the running/paused state."""
+        if self._deadline is None:
+            self._remaining = float(seconds)
+        else:
+            self._deadline = self.clock() + seconds
+
+    def adjust(self, delta):
+        self.set(max(0.0, self.remaining() + delta))
+
+    def roll_over(self, seconds):
+        """Start the next period at the moment this one ended, not when we noticed.
+        Whatever the tick overshot is carried into the new period instead of being lost."""
+        if self._deadline is None:
+            self._remaining = float(seconds)
+        else:
+            self._deadline = max(self._deadline, self.clock() - seconds) + seconds
+
+    def next_tick_delay_ms(self):
+        """Milliseconds until the remaining time crosses its next whole second."""
+        left = self.remaining()
+        fraction = left - math.floor(left)
+        if fraction <= 0.0:
+            fraction = 1.0
+        delay = math.ceil(fraction * 1000) + 1  # land just past the boundary
+        self._expected_tick = self.clock() + delay / 1000
+        return delay
+
+    def _mark(self):
+        self._last_mono = self.clock()
+        self._last_wall = self.wall_clock()
+
+    def tick(self):
+        """Call from every scheduled tick. Returns the size in seconds of a suspend/stall
+        gap detected since the previous tick, or None."""
+        now = self.clock()
+        gap = 0.0
+        if self._expected_tick is not None:
+            gap = now - self._expected_tick  # we were woken up late
+        if self._last_mono is not None:
+            # Some platforms stop the monotonic clock during suspend; the wall clock keeps going.
+            gap = max(gap, (self.wall_clock() - self._last_wall) - (now - self._last_mono))
+        self._expected_tick = None
+        self._mark()
+        return gap if gap >= self.GAP_THRESHOLD else None
+
+
+def format_remaining(seconds):
+    """MM:SS with the current second rounded up, so a fresh 50 minutes shows 50:00."""
+    whole = math.ceil(seconds - 1e-9)
+    return f"{whole // 60:02d}:{whole % 60:02d}"
+
+
+def simulate_day(hours=8, jitter_ms=40, work_ms=3, stall_every=600, stall_ms=1500, seed=1):
+    """Test harness: run `hours` of ticks on a simulated clock where every callback
+    fires up to `jitter_ms` late, each tick spends `work_ms` redrawing, and every
+    `stall_every` ticks the loop is blocked for `stall_ms` (e.g. a modal dialog).
+
+    Returns (deadline error, legacy drift) in seconds: how far after the true end the
+    Countdown reached zero, and how far the old subtract-the-delta loop had drifted
+    by the same moment."""
+    import random
+
+    rng = random.Random(seed)
+    now = [0.0]
+    total = hours * 3600
+    countdown = Countdown(total, clock=lambda: now[0], wall_clock=lambda: now[0])
+    countdown.start()
+
+    # The old WorkTimer.update_timer: remaining -= now - start; ...work...; start = now
+    legacy_remaining, legacy_start = float(total), 0.0
+
+    ticks = 0
+    while countdown.remaining() > 0:
+        delay = countdown.next_tick_delay_ms()
+        late = rng.uniform(0, jitter_ms)
+        ticks += 1
+        if ticks % stall_every == 0:
+            late += stall_ms
+        now[0] += (delay + late) / 1000
+        countdown.tick()
+
+        legacy_remaining -= now[0] - legacy_start
+        now[0] += work_ms / 1000
+        legacy_start = now[0]
+
+    error = now[0] - work_ms / 1000 - total
+    legacy_drift = legacy_remaining - (total - now[0])
+    return error, legacy_drift
+
+
+if __name__ == "__main__":
+    error, legacy_drift = simulate_day()
+    print(f"Simulated 8 hour day: countdown reached zero {error * 1000:.0f} ms after the true deadline "
+          f"(one tick is 1000 ms); the old loop had drifted {legacy_drift:.1f} s by then.")
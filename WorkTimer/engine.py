@@ -0,0 +1,225 @@
+# engine.py
+import time
+from collections import namedtuple
+
+from WorkTimer.countdown import Countdown
+from WorkTimer.posture import DEFAULT_POSTURE_CURVE, PostureSchedule
+
+# One work or break period as it actually happened (times from wall_clock)
+Session = namedtuple("Session", "mode started_at ended_at planned_seconds actual_seconds completed")
+
+
+class PomodoroEngine:
+    """The work/break timer without any Tk.
+
+    Holds the countdown, which phase we're in, the time adjustments and the posture
+    stage. A view drives it by calling advance() whenever next_wakeup_ms() says
+    something is due, and reacts to the hooks:
+
+        on_phase_change(is_working)   a work or break period just ended
+        on_posture_change(state)      the posture stage changed
+        on_gap(seconds)               a suspend/stall was detected
+        on_session_end(session)       a period ended, or was cut short by reset (a Session)
+
+    `clock` and `wall_clock` default to the real clocks; pass a VirtualClock to run
+    hours of timer in microseconds (see simulate_year).
+    """
+
+    def __init__(self, work_seconds=50 * 60, break_seconds=5 * 60, posture_curve=DEFAULT_POSTURE_CURVE,
+                 clock=time.monotonic, wall_clock=time.time):
+        self.original_work_time = work_seconds  # what reset() goes back to
+        self.work_time = work_seconds
+        self.break_time = break_seconds
+        self.wall_clock = wall_clock
+        self.countdown = Countdown(work_seconds, clock=clock, wall_clock=wall_clock)
+        self.is_working = True
+        self.is_running = False
+        self.last_gap = None  # seconds lost to the most recent suspend/stall, if any
+
+        # Posture state (0-4), changing at instants precomputed for the work interval
+        self.posture_curve = posture_curve
+        self.posture_schedule = PostureSchedule(work_seconds, posture_curve)
+        self.posture_state = 0
+
+        # The current period: when it was first started, its planned length and the
+        # length after any +/- adjustments
+        self.period_started_at = None
+        self.period_planned = work_seconds
+        self.period_length = work_seconds
+
+        self.on_phase_change = None
+        self.on_posture_change = None
+        self.on_gap = None
+        self.on_session_end = None
+
+    @property
+    def time_remaining(self):
+        return self.countdown.remaining()
+
+    @time_remaining.setter
+    def time_remaining(self, seconds):
+        self.countdown.set(seconds)
+
+    @property
+    def mode(self):
+        return "Work" if self.is_working else "Break"
+
+    def start(self):
+        if not self.is_running:
+            self.is_running = True
+            self.countdown.start()
+            if self.period_started_at is None:
+                self.period_started_at = self.wall_clock()
+
+    def pause(self):
+        if self.is_running:
+            self.is_running = False
+            self.countdown.pause()
+
+    def toggle(self):
+        """Start or pause; returns whether the timer is now running."""
+        if self.is_running:
+            self.pause()
+        else:
+            self.start()
+        return self.is_running
+
+    def reset(self):
+        self.pause()
+        if self.period_started_at is not None:
+            actual = self.period_length - self.time_remaining
+            if actual > 0:
+                self._end_session(self.wall_clock(), actual, completed=False)
+        self.is_working = True
+        self.work_time = self.original_work_time
+        self.time_remaining = self.work_time
+        self._begin_period(None, self.work_time)
+        # The work length may have changed (e.g. a profile's focus minutes), so rebuild the schedule
+        self.posture_schedule = PostureSchedule(self.original_work_time, self.posture_curve)
+        self.posture_state = 0
+
+    def adjust(self, delta):
+        """Add (or with a negative delta, take away) time from the current period."""
+        before = self.time_remaining
+        self.countdown.adjust(delta)
+        self.period_length += self.time_remaining - before
+        if self.is_working:
+            self.work_time = self.time_remaining
+        self._update_posture()
+
+    def advance(self):
+        """Catch up with the clock: report gaps, end every period whose deadline has
+        passed and update the posture stage. Call at each wakeup."""
+        if not self.is_running:
+            return
+        gap = self.countdown.tick()
+        if gap is not None:
+            self.last_gap = gap
+            if self.on_gap:
+                self.on_gap(gap)
+
+        while self.countdown.remaining() <= 0:
+            # The next period starts at the old deadline, so no time is lost between them.
+            ended_at = self.wall_clock() - self.countdown.overshoot()
+            self._end_session(ended_at, self.period_length, completed=True)
+            if self.is_working:
+                self.is_working = False
+                self.countdown.roll_over(self.break_time)
+                self._begin_period(ended_at, self.break_time)
+            else:
+                self.is_working = True
+                self.work_time = self.original_work_time
+                self.countdown.roll_over(self.work_time)
+                self._begin_period(ended_at, self.work_time)
+            if self.on_phase_change:
+                self.on_phase_change(self.is_working)
+        self._update_posture()
+
+    def _begin_period(self, started_at, seconds):
+        self.period_started_at = started_at
+        self.period_planned = self.period_length = seconds
+
+    def _end_session(self, ended_at, actual, completed):
+        if self.on_session_end:
+            mode = "work" if self.is_working else "break"
+            self.on_session_end(Session(mode, self.period_started_at, ended_at,
+                                        self.period_planned, actual, completed))
+
+    def _update_posture(self):
+        state = self.posture_schedule.state_at(self.time_remaining) if self.is_working else 0
+        if state != self.posture_state:
+            self.posture_state = state
+            if self.on_posture_change:
+                self.on_posture_change(state)
+
+    def next_wakeup_ms(self, every_second=True):
+        """Milliseconds until advance() has something to do, or None while paused.
+
+        With `every_second` that is the next whole second of the display; without it
+        (nobody is looking) only the end of the period or the next posture change."""
+        if not self.is_running:
+            return None
+        remaining = self.time_remaining
+        if every_second:
+            delay = self.countdown.next_tick_delay_ms()
+        else:
+            delay = int(remaining * 1000) + 1
+        if self.is_working:
+            wait = self.posture_schedule.seconds_until_change(remaining)
+            if wait is not None:
+                delay = min(delay, int(wait * 1000) + 1)
+        return delay
+
+
+class VirtualClock:
+    """A clock that only moves when told to; use one for both clock and wall_clock."""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def simulate_year(days=365, hours_per_day=8):
+    """Test harness: run the engine for `hours_per_day` of every day on a virtual clock,
+    waking only when the engine asks to (as when the page is hidden), and pause
+    overnight. Returns (completed work periods, posture changes, wakeups)."""
+    clock = VirtualClock()
+    engine = PomodoroEngine(clock=clock, wall_clock=clock)
+    counts = {"work": 0, "posture": 0, "wakeups": 0}
+
+    def on_phase_change(is_working):
+        if not is_working:
+            counts["work"] += 1
+
+    def on_posture_change(state):
+        counts["posture"] += 1
+
+    engine.on_phase_change = on_phase_change
+    engine.on_posture_change = on_posture_change
+
+    for _ in range(days):
+        engine.start()
+        end_of_day = clock.now + hours_per_day * 3600
+        while clock.now + engine.next_wakeup_ms(every_second=False) / 1000 <= end_of_day:
+            clock.sleep(engine.next_wakeup_ms(every_second=False) / 1000)
+            engine.advance()
+            counts["wakeups"] += 1
+        clock.sleep(end_of_day - clock.now)
+        engine.advance()
+        engine.pause()
+        clock.sleep((24 - hours_per_day) * 3600)  # overnight, paused
+    return counts["work"], counts["posture"], counts["wakeups"]
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    work_periods, posture_changes, wakeups = simulate_year()
+    took = time.perf_counter() - start
+    cycles = 365 * 8 * 3600 / (55 * 60)  # 50 min work + 5 min break
+    print(f"Simulated a year of 8 hour days in {took * 1000:.0f} ms ({wakeups} wakeups): "
+          f"{work_periods} work periods (expected {int(cycles)}), {posture_changes} posture changes")
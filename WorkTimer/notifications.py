@@ -0,0 +1,93 @@
+# notifications.py
+import tkinter as tk
+from collections import deque
+
+
+class ToastQueue:
+    """Non-modal notifications drawn on top of a frame.
+
+    Unlike messagebox.showinfo nothing here waits for the user, so timer loops keep
+    running. Toasts stack from the bottom of `parent`, disappear after `duration_ms`
+    (or when clicked), and an identical message shown again while the first is still
+    up or waiting is folded into it with a repeat count instead of piling up.
+    """
+
+    def __init__(self, parent, duration_ms=8000, max_visible=3, bg='#4B3621', fg='#F5F5DC'):
+        self.parent = parent
+        self.duration_ms = duration_ms
+        self.max_visible = max_visible
+        self.bg = bg
+        self.fg = fg
+        self.visible = []      # toasts on screen, oldest first
+        self.waiting = deque() # toasts beyond max_visible
+
+    def show(self, title, message, duration_ms=None):
+        key = (title, message)
+        for toast in list(self.visible) + list(self.waiting):
+            if toast["key"] == key:
+                toast["count"] += 1
+                if toast in self.visible:
+                    self._refresh_text(toast)
+                    self._arm_expiry(toast)
+                return
+
+        toast = {"key": key, "count": 1, "duration": duration_ms or self.duration_ms,
+                 "frame": None, "after_id": None}
+        if len(self.visible) < self.max_visible:
+            self._display(toast)
+        else:
+            self.waiting.append(toast)
+
+    def clear(self):
+        self.waiting.clear()
+        for toast in list(self.visible):
+            self.dismiss(toast)
+
+    def _display(self, toast):
+        message = toast["key"][1]
+        frame = tk.Frame(self.parent, bg=self.bg, bd=0, padx=14, pady=8, cursor="hand2")
+        toast["title"] = tk.Label(frame, font=("Arial", 12, "bold"), fg=self.fg, bg=self.bg, anchor="w")
+        toast["title"].pack(fill="x")
+        body = tk.Label(frame, text=message, font=("Arial", 10), fg=self.fg, bg=self.bg,
+                        justify="left", anchor="w")
+        body.pack(fill="x")
+        for widget in (frame, toast["title"], body):
+            widget.bind("<Button-1>", lambda e, t=toast: self.dismiss(t))
+
+        toast["frame"] = frame
+        self.visible.append(toast)
+        self._refresh_text(toast)
+        self._arm_expiry(toast)
+        self._restack()
+
+    def _refresh_text(self, toast):
+        title = toast["key"][0]
+        if toast["count"] > 1:
+            title = f"{title}  (x{toast['count']})"
+        toast["title"].config(text=title)
+
+    def _arm_expiry(self, toast):
+        if toast["after_id"] is not None:
+            self.parent.after_cancel(toast["after_id"])
+        toast["after_id"] = self.parent.after(toast["duration"], lambda: self.dismiss(toast))
+
+    def dismiss(self, toast):
+        if toast not in self.visible:
+            return
+        self.visible.remove(toast)
+        if toast["after_id"] is not None:
+            self.parent.after_cancel(toast["after_id"])
+        toast["frame"].destroy()
+        while self.waiting and len(self.visible) < self.max_visible:
+            self._display(self.waiting.popleft())
+        self._restack()
+
+    def _restack(self):
+        """Newest toast at the bottom, older ones above it."""
+        y = -12
+        for toast in reversed(self.visible):
+            frame = toast["frame"]
+            frame.place(relx=0.5, rely=1.0, anchor="s", y=y)
+            frame.lift()
+            frame.update_idletasks()
+            y -= frame.winfo_reqheight() + 8
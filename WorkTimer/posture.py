@@ -0,0 +1,48 @@
+# posture.py
+from bisect import bisect_left
+
+# Fraction of the work interval that has passed when each slouch stage (1-4) begins.
+# For a 50 minute session these are the original thresholds of 41/31/21/11 minutes left.
+DEFAULT_POSTURE_CURVE = (0.18, 0.38, 0.58, 0.78)
+
+POSTURE_CURVES = {
+    "default": DEFAULT_POSTURE_CURVE,
+    "even": (0.2, 0.4, 0.6, 0.8),
+    "early": (0.1, 0.25, 0.45, 0.7),   # nag sooner, e.g. for long sessions
+    "late": (0.3, 0.5, 0.7, 0.85),
+}
+
+
+class PostureSchedule:
+    """When the avatar changes posture during a work interval of any length.
+
+    The transition instants are computed once, proportionally to `work_seconds`,
+    so callers can look up the stage for any remaining time and arm a single
+    callback for the next change instead of re-checking every second.
+    """
+
+    def __init__(self, work_seconds, curve=DEFAULT_POSTURE_CURVE):
+        if isinstance(curve, str):
+            curve = POSTURE_CURVES[curve]
+        curve = tuple(curve)
+        if any(not 0 < f < 1 for f in curve) or list(curve) != sorted(curve):
+            raise ValueError("posture curve must be increasing fractions between 0 and 1")
+        self.work_seconds = work_seconds
+        self.curve = curve
+        # Elapsed seconds after which each stage begins, rounded to shed float noise (0.18 * 3000).
+        self.transitions = [round(f * work_seconds, 6) for f in curve]
+
+    @property
+    def final_state(self):
+        return len(self.transitions)
+
+    def state_at(self, remaining):
+        """Posture stage (0 = upright) with `remaining` seconds of work left."""
+        return bisect_left(self.transitions, self.work_seconds - remaining)
+
+    def seconds_until_change(self, remaining):
+        """Seconds until the stage next changes while counting down, or None in the final stage."""
+        stage = self.state_at(remaining)
+        if stage >= self.final_state:
+            return None
+        return remaining - (self.work_seconds - self.transitions[stage])
@@ -1,10 +1,34 @@
 # work_timer.py
 import tkinter as tk
-from tkinter import messagebox
-import time
 import os
 
+from WorkTimer.countdown import format_remaining
+from WorkTimer.engine import PomodoroEngine
+from WorkTimer.activity import ActivityRecorder
+from WorkTimer.notifications import ToastQueue
+from Assets.registry import asset_registry
+from Animation.frame_clock import frame_clock
+from Login import history
+
+
+def engine_attribute(name):
+    """A WorkTimer attribute that lives on its PomodoroEngine (the profile code sets these directly)."""
+    return property(lambda self: getattr(self.engine, name),
+                    lambda self, value: setattr(self.engine, name, value))
+
+
 class WorkTimer(tk.Frame):
+    """The timer page: a view over a PomodoroEngine, which holds all the timer logic."""
+
+    work_time = engine_attribute("work_time")
+    original_work_time = engine_attribute("original_work_time")
+    break_time = engine_attribute("break_time")
+    time_remaining = engine_attribute("time_remaining")
+    is_working = engine_attribute("is_working")
+    is_running = engine_attribute("is_running")
+    posture_state = engine_attribute("posture_state")
+    posture_curve = engine_attribute("posture_curve")
+
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#F5F5DC')
         self.controller = controller
@@ -22,17 +46,29 @@ class WorkTimer(tk.Frame):
         attach_profile(root, self, title_prefix="Posture Pomodoro Timer")
 
 
-        # Timer variables
-        self.original_work_time = 50 * 60  # 50 minutes
-        self.work_time = 50 * 60
-        self.break_time = 5 * 60
-        self.time_remaining = self.work_time
-        self.is_working = True
-        self.is_running = False
-        self.start_time = None
+        # Timer logic: 50 minutes work / 5 minutes break, posture stages, deadlines
+        self.engine = PomodoroEngine(work_seconds=50 * 60, break_seconds=5 * 60)
+        self.engine.on_phase_change = self.on_phase_change
+        self.engine.on_posture_change = lambda state: self.draw_scene()
+        self.engine.on_gap = self.report_gap
+        self.engine.on_session_end = self.record_session
+        self.tick_task = None  # pending wakeup on the root's shared frame clock
 
-        # Posture state (0-4)
-        self.posture_state = 0
+        # 1 Hz trace of the timer and posture state (fixed-size files, see activity.py)
+        try:
+            self.activity = ActivityRecorder()
+        except (OSError, ValueError) as e:
+            print(f"Activity trace disabled: {e}")
+            self.activity = None
+        self.page_visible = True  # while hidden we only wake up for the end of a period
+
+        # Retained canvas items (created once, then updated in place)
+        self.scene_items = {}
+        self.rendered_posture = None
+        self.render_pending = False
+        self.items_created = 0            # canvas items created so far
+        self.items_created_last_tick = 0  # ...of which during the previous tick (0 once built)
+        self.items_seen_at_tick = 0
 
         # Load images
         self.posture_images = []
@@ -42,25 +78,24 @@ class WorkTimer(tk.Frame):
         # Create GUI elements
         self.create_widgets()
 
-        # Start the timer update loop
-        self.update_timer()
+        # Break/work reminders as in-app toasts, so the timer loop never waits on a dialog
+        self.toasts = ToastQueue(self)
 
     def load_images(self):
         try:
             image_dir = "WorkTimer"
             for i in range(1, 5):
                 image_path = os.path.join(image_dir, f"posture{i}.png")
-                if os.path.exists(image_path):
-                    img = tk.PhotoImage(file=image_path).zoom(4, 4)
-                    self.posture_images.append(img)
+                if asset_registry.exists(image_path):
+                    self.posture_images.append(asset_registry.image(image_path, zoom=4))
                 else:
                     print(f"Image not found: {image_path}")
                     self.posture_images = None
                     break
 
             computer_path = os.path.join(image_dir, "computer-removebg-preview.png")
-            if os.path.exists(computer_path):
-                self.computer_image = tk.PhotoImage(file=computer_path).subsample(2, 2)
+            if asset_registry.exists(computer_path):
+                self.computer_image = asset_registry.image(computer_path, subsample=2)
             else:
                 print(f"Image not found: {computer_path}")
                 self.computer_image = None
@@ -187,146 +222,198 @@ class WorkTimer(tk.Frame):
         self.draw_scene()
 
     def draw_scene(self):
-        self.canvas.delete("all")
+        """Mark the scene dirty. The canvas is updated at most once per frame, when Tk goes idle."""
+        if not self.render_pending:
+            self.render_pending = True
+            self.after_idle(self.render_scene)
+
+    def create_item(self, kind, *args, **kwargs):
+        """canvas.create_<kind>, counted so we can check nothing is recreated per tick."""
+        self.items_created += 1
+        return getattr(self.canvas, f"create_{kind}")(*args, **kwargs)
+
+    def build_scene(self):
+        """Create every canvas item once; render_scene only updates them afterwards."""
         canvas_center_x = 300
         canvas_center_y = 175
+        items = self.scene_items
 
         if self.posture_images and len(self.posture_images) >= 4:
             avatar_x = canvas_center_x + 15
             avatar_y = canvas_center_y + 20
-            img_index = min(self.posture_state, 3)
-            self.canvas.create_image(avatar_x, avatar_y, image=self.posture_images[img_index], anchor=tk.CENTER)
+            items["avatar"] = self.create_item("image", avatar_x, avatar_y,
+                                               image=self.posture_images[0], anchor=tk.CENTER)
         else:
-            self.draw_avatar_fallback(canvas_center_x - 120, canvas_center_y + 20)
+            self.build_avatar_fallback()
 
         if self.computer_image:
             comp_x = canvas_center_x + 120
             comp_y = canvas_center_y + 20
-            self.canvas.create_image(comp_x, comp_y, image=self.computer_image, anchor=tk.CENTER)
+            items["computer"] = self.create_item("image", comp_x, comp_y,
+                                                 image=self.computer_image, anchor=tk.CENTER)
         else:
             comp_width = 100
             comp_height = 70
             comp_x = canvas_center_x + 120 - comp_width/2
             comp_y = canvas_center_y + 20 - comp_height/2
-            self.canvas.create_rectangle(
-                comp_x, comp_y, comp_x + comp_width, comp_y + comp_height,
+            items["computer"] = self.create_item(
+                "rectangle", comp_x, comp_y, comp_x + comp_width, comp_y + comp_height,
                 fill='#2F4F4F', outline='#2F4F4F', width=2
             )
 
-    def draw_avatar_fallback(self, x, y):
+    def render_scene(self):
+        self.render_pending = False
+        if not self.scene_items:
+            self.build_scene()
+        if self.posture_state == self.rendered_posture:
+            return
+        self.rendered_posture = self.posture_state
+
+        if "avatar" in self.scene_items:
+            img_index = min(self.posture_state, 3)
+            self.canvas.itemconfig(self.scene_items["avatar"], image=self.posture_images[img_index])
+        else:
+            self.update_avatar_fallback()
+
+    def build_avatar_fallback(self):
+        items = self.scene_items
+        items["head"] = self.create_item("oval", 0, 0, 0, 0, fill='#FFEBCD', outline='#DEB887', width=2)
+        items["eye"] = self.create_item("oval", 0, 0, 0, 0, fill='#4B3621')
+        items["mouth_flat"] = self.create_item("line", 0, 0, 0, 0, fill='#4B3621', width=2)
+        items["mouth_frown"] = self.create_item("arc", 0, 0, 0, 0, start=0, extent=-180,
+                                                fill='', outline='#4B3621', width=2)
+        items["neck"] = self.create_item("line", 0, 0, 0, 0, fill='#FFEBCD', width=6)
+        items["shoulders"] = self.create_item("line", 0, 0, 0, 0, fill='#FFEBCD', width=16)
+        items["back"] = self.create_item("line", 0, 0, 0, 0, fill='#FFEBCD', width=10)
+
+    def update_avatar_fallback(self):
+        canvas_center_x = 300
+        canvas_center_y = 175
+        x = canvas_center_x - 120
+        y = canvas_center_y + 20
+        items = self.scene_items
+        coords = self.canvas.coords
+
         head_y = y - 40
         neck_length = 20 + (self.posture_state * 8)
         shoulder_y = head_y + neck_length
         back_curve = self.posture_state * 12
 
-        self.canvas.create_oval(
-            x - 25, head_y - 25, x + 25, head_y + 25,
-            fill='#FFEBCD', outline='#DEB887', width=2
-        )
-        self.canvas.create_oval(x + 5, head_y - 10, x + 15, head_y, fill='#4B3621')
+        coords(items["head"], x - 25, head_y - 25, x + 25, head_y + 25)
+        coords(items["eye"], x + 5, head_y - 10, x + 15, head_y)
 
         mouth_y = head_y + 10
-        if self.posture_state < 3:
-            self.canvas.create_line(x - 5, mouth_y, x + 5, mouth_y, fill='#4B3621', width=2)
-        else:
-            self.canvas.create_arc(x - 5, mouth_y - 3, x + 5, mouth_y + 3,
-                                   start=0, extent=-180, fill='', outline='#4B3621', width=2)
+        coords(items["mouth_flat"], x - 5, mouth_y, x + 5, mouth_y)
+        coords(items["mouth_frown"], x - 5, mouth_y - 3, x + 5, mouth_y + 3)
+        frowning = self.posture_state >= 3
+        self.canvas.itemconfig(items["mouth_flat"], state="hidden" if frowning else "normal")
+        self.canvas.itemconfig(items["mouth_frown"], state="normal" if frowning else "hidden")
 
-        self.canvas.create_line(x, head_y + 25, x, shoulder_y, fill='#FFEBCD', width=6)
-        self.canvas.create_line(x - 30, shoulder_y, x + 30, shoulder_y, fill='#FFEBCD', width=16)
-        self.canvas.create_line(x, shoulder_y, x - back_curve, shoulder_y + 80, fill='#FFEBCD', width=10)
+        coords(items["neck"], x, head_y + 25, x, shoulder_y)
+        coords(items["shoulders"], x - 30, shoulder_y, x + 30, shoulder_y)
+        coords(items["back"], x, shoulder_y, x - back_curve, shoulder_y + 80)
 
     def start_timer(self):
-        if not self.is_running:
-            self.is_running = True
-            self.start_time = time.time()
+        if self.engine.toggle():
             self.start_button.config(text="Pause")
-            self.status_label.config(text="Work Mode")
+            self.schedule_tick()
         else:
-            self.is_running = False
+            self.cancel_tick()
             self.start_button.config(text="Resume")
-            mode = "Work" if self.is_working else "Break"
-            self.status_label.config(text=f"{mode} Mode")
+        self.status_label.config(text=f"{self.engine.mode} Mode")
+        self.record_activity()
 
     def reset_timer(self):
-        self.is_running = False
-        self.is_working = True
-        self.work_time = self.original_work_time
-        self.time_remaining = self.work_time
-        self.posture_state = 0
+        self.engine.reset()
+        self.cancel_tick()
         self.start_button.config(text="Start")
         self.status_label.config(text="Work Mode")
         self.update_timer_display()
         self.draw_scene()
-
-    def update_timer(self):
+        self.record_activity()
+
+    def schedule_tick(self):
+        """Arm the next wakeup the engine asks for: the next whole second of the display,
+        or, while the page is hidden, only the end of the period or a posture change."""
+        self.cancel_tick()
+        delay = self.engine.next_wakeup_ms(every_second=self.page_visible)
+        if delay is not None:
+            self.tick_task = frame_clock(self).after(delay, self.update_timer, widget=self)
+
+    def on_show(self):
+        """Page lifecycle hook (see App.show_frame): back to once-a-second ticks."""
+        self.page_visible = True
         if self.is_running:
-            elapsed = time.time() - self.start_time
-            self.time_remaining -= elapsed
-            self.update_posture_state()
-
-            if self.time_remaining <= 0:
-                self.is_running = False
-                if self.is_working:
-                    self.is_working = False
-                    self.time_remaining = self.break_time
-                    self.show_break_message()
-                    self.posture_state = 0
-                    self.status_label.config(text="Break Mode")
-                else:
-                    self.is_working = True
-                    self.work_time = self.original_work_time
-                    self.time_remaining = self.work_time
-                    self.show_work_message()
-                    self.status_label.config(text="Work Mode")
-                self.draw_scene()
-                self.start_time = time.time()
-                self.is_running = True
-
-            self.start_time = time.time()
             self.update_timer_display()
+            self.schedule_tick()
 
-        self.after(1000, self.update_timer)
+    def on_hide(self):
+        """Page lifecycle hook: stop per-second ticks. The countdown keeps its deadline,
+        so the logical time is unaffected, and one wakeup is kept for the period switch."""
+        self.page_visible = False
+        if self.is_running:
+            self.schedule_tick()
+
+    def cancel_tick(self):
+        if self.tick_task is not None:
+            self.tick_task.cancel()
+            self.tick_task = None
+
+    def update_timer(self):
+        self.tick_task = None
+        if not self.is_running:
+            return
+
+        self.items_created_last_tick = self.items_created - self.items_seen_at_tick
+        self.items_seen_at_tick = self.items_created
+
+        self.engine.advance()  # calls on_phase_change / draw_scene / report_gap as needed
+        self.update_timer_display()
+        self.record_activity()
+        self.schedule_tick()
+
+    def record_activity(self):
+        """Add the current state to the activity trace. Seconds without a tick (page hidden)
+        are filled in by the recorder, so this only has to run when something changes."""
+        if self.activity is not None:
+            engine = self.engine
+            self.activity.record(engine.is_running, engine.is_working, engine.posture_state, engine.time_remaining)
+
+    def on_phase_change(self, is_working):
+        self.status_label.config(text=f"{self.engine.mode} Mode")
+        if is_working:
+            self.show_work_message()
+        else:
+            self.show_break_message()
+
+    def record_session(self, session):
+        """Log a finished (or reset) period; this also keeps the work streak up to date."""
+        username = getattr(self.controller, "current_user", None)
+        try:
+            history.record_session(username, *session)
+        except Exception as e:
+            print(f"Could not record {session.mode} session: {e}")
+
+    def report_gap(self, gap):
+        """The app was suspended or the loop was blocked; the deadline already accounts for it."""
+        self.status_label.config(text=f"{self.engine.mode} Mode (resumed after {int(gap // 60)}m {int(gap % 60)}s away)")
 
     def update_timer_display(self):
-        minutes = self.time_remaining // 60
-        seconds = self.time_remaining % 60
-        timer_text = f"{int(minutes):02d}:{int(seconds):02d}"
-        self.timer_label.config(text=timer_text)
-        self.draw_scene()
+        self.timer_label.config(text=format_remaining(self.time_remaining))
 
     def decrease_time(self):
-        self.time_remaining -= 60
-        if self.time_remaining < 0:
-            self.time_remaining = 0
-        if self.is_working:
-            self.work_time = self.time_remaining
-        self.update_posture_state()
+        self.engine.adjust(-60)
         self.update_timer_display()
+        self.record_activity()
+        if self.is_running:
+            self.schedule_tick()  # the next posture change moved
 
     def increase_time(self):
-        self.time_remaining += 60
-        if self.is_working:
-            self.work_time = self.time_remaining
-        self.update_posture_state()
+        self.engine.adjust(60)
         self.update_timer_display()
-
-    def update_posture_state(self):
-        if self.is_working:
-            minutes_remaining = self.time_remaining // 60
-            if minutes_remaining >= 41:
-                self.posture_state = 0
-            elif minutes_remaining >= 31:
-                self.posture_state = 1
-            elif minutes_remaining >= 21:
-                self.posture_state = 2
-            elif minutes_remaining >= 11:
-                self.posture_state = 3
-            else:
-                self.posture_state = 4
-        else:
-            self.posture_state = 0
-        self.draw_scene()
+        self.record_activity()
+        if self.is_running:
+            self.schedule_tick()
 
     def show_break_message(self):
         break_tasks = [
@@ -336,9 +423,9 @@ class WorkTimer(tk.Frame):
             "4. Stretch your arms and shoulders"
         ]
         message = "Time for a break!\n\nPlease do the following:\n\n" + "\n".join(break_tasks)
-        messagebox.showinfo("Break Time!", message)
+        self.toasts.show("Break Time!", message, duration_ms=30000)
 
     def show_work_message(self):
-        messagebox.showinfo("Work Time", "Break is over! Time to get back to work.")
+        self.toasts.show("Work Time", "Break is over! Time to get back to work.")
 
     
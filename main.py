@@ -1,11 +1,31 @@
 # ---- IMPORTANT: To anyone wishing to add their page: Please follow the steps in the comments below. ----
 
 # main.py
+import importlib
+import os
+import time
+
+# Set TOUCH_GRASS_TRACE=1 or pass --trace to record where startup time goes (before tkinter is imported
+# so that import is timed too). See Diagnostics/startup_trace.py.
+from Diagnostics.startup_trace import tracer
+tracer.start_from_args()
+
 import tkinter as tk
 
-#STEP 1: IMPORT YOUR PAGE HERE. e.g. from FolderName.python_file import ClassName
-from Homepage.homepage import HomePage
-from WorkTimer.work_timer import WorkTimer
+from Assets.registry import asset_registry
+
+# STEP 1: REGISTER YOUR PAGE HERE. e.g. "ClassName": "FolderName.python_file:ClassName"
+# Pages are imported and built the first time show_frame asks for them, so a new page
+# costs nothing at startup.
+PAGES = {
+    "HomePage": "Homepage.homepage:HomePage",
+    "WorkTimer": "WorkTimer.work_timer:WorkTimer",
+}
+
+# STEP 2 (OPTIONAL): ADD ClassName HERE TO BUILD THE PAGE IN THE BACKGROUND AFTER THE HOME SCREEN
+# IS UP, so opening it later is instant.
+PREWARM_PAGES = ("WorkTimer",)
+PREWARM_DELAY_MS = 500
 
 class App(tk.Tk):
     def __init__(self):
@@ -14,18 +34,29 @@ class App(tk.Tk):
         self.geometry("640x640")
         self.resizable(False, False)
 
-        container = tk.Frame(self)
-        container.pack(fill="both", expand=True)
+        self.container = tk.Frame(self)
+        self.container.pack(fill="both", expand=True)
 
         self.frames = {}
+        self.current_page = None
+        self.minimised = False
+        self.current_user = None  # set by log_in; the work timer records history (and streaks) for this user
 
-        # STEP 2: INSERT ClassName OF YOUR PAGE. 
-        for PageClass in (HomePage, WorkTimer): # ADD INSIDE OF BRACKETS HERE.
-            frame = PageClass(parent=container, controller=self)
-            self.frames[PageClass.__name__] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
+        # The main window stays hidden until someone logs in (see open_login)
+        self.withdraw()
 
+        # Only the home page is built before the first frame
         self.show_frame("HomePage")
+        self.after(PREWARM_DELAY_MS, lambda: self.after_idle(self.prewarm_next, list(PREWARM_PAGES)))
+
+        # Pause the visible page's loops while the window is minimised
+        self.bind("<Unmap>", self.on_unmap)
+        self.bind("<Map>", self.on_map)
+        tracer.watch_first_paint(self)
+
+        # Set TOUCH_GRASS_CPU_REPORT=1 to print how busy the app is (and what the asset cache holds) every few seconds
+        if os.environ.get("TOUCH_GRASS_CPU_REPORT"):
+            self.report_cpu(time.perf_counter(), time.process_time())
 
         # Main Menu Button
         home_page = self.frames["HomePage"]
@@ -38,15 +69,88 @@ class App(tk.Tk):
             command=lambda: (home_page.toggle_menu(), self.show_frame("ClassName"))
         )
         """
+        # show_frame builds the page on first use, so this works for pages that aren't built yet.
         home_page.work_timer_button.config(
             command=lambda: [self.show_frame("WorkTimer"), home_page.toggle_menu()]
         )
-        
+
+        self.auth = None
+        self.after_idle(self.open_login)
+
+    def open_login(self):
+        """Load the login code once the home page is built. AuthWindow creates the tables and
+        resumes a remembered login on its worker thread, or asks for a password."""
+        from Login.auth_ui import AuthWindow
+        self.auth = AuthWindow(self, on_success=self.log_in,
+                               on_prompt=lambda: tracer.begin_wait("login prompt"))
+
+    def log_in(self, username):
+        """AuthWindow callback: remember who is using the app and show it."""
+        tracer.end_wait()
+        self.current_user = username
+        self.deiconify()
+
+    def get_page(self, page_name):
+        """Return the page, importing its module and building it on first use."""
+        frame = self.frames.get(page_name)
+        if frame is None:
+            module_name, class_name = PAGES[page_name].split(":")
+            with tracer.span(f"import {module_name}", "import"):
+                PageClass = getattr(importlib.import_module(module_name), class_name)
+            with tracer.span(f"build {page_name}", "page"):
+                frame = PageClass(parent=self.container, controller=self)
+            self.frames[page_name] = frame
+            frame.grid(row=0, column=0, sticky="nsew")
+        return frame
+
+    def prewarm_next(self, page_names):
+        """Build one not-yet-built page per idle slot, keeping it hidden."""
+        while page_names and page_names[0] in self.frames:
+            page_names.pop(0)
+        if not page_names:
+            return
+        frame = self.get_page(page_names.pop(0))
+        if frame is not self.current_page:
+            frame.lower()
+            notify_page(frame, "on_hide")
+        self.after_idle(self.prewarm_next, page_names)
 
     def show_frame(self, page_name):
-        frame = self.frames[page_name]
+        frame = self.get_page(page_name)
+        previous, self.current_page = self.current_page, frame
+        if previous is not None and previous is not frame:
+            notify_page(previous, "on_hide")
         frame.tkraise()
+        if previous is not frame and not self.minimised:
+            notify_page(frame, "on_show")
+
+    def on_unmap(self, event):
+        # <Unmap>/<Map> bound on the root also fire for every child widget
+        if event.widget is self and not self.minimised:
+            self.minimised = True
+            notify_page(self.current_page, "on_hide")
+
+    def on_map(self, event):
+        if event.widget is self and self.minimised:
+            self.minimised = False
+            notify_page(self.current_page, "on_show")
+
+    def report_cpu(self, wall, cpu, interval_ms=5000):
+        now_wall, now_cpu = time.perf_counter(), time.process_time()
+        if now_wall > wall:
+            page = type(self.current_page).__name__
+            state = "minimised" if self.minimised else f"showing {page}"
+            print(f"CPU {100 * (now_cpu - cpu) / (now_wall - wall):5.1f}% ({state}); {asset_registry.summary()}")
+        self.after(interval_ms, self.report_cpu, now_wall, now_cpu)
+
+
+def notify_page(page, hook):
+    """Call a page's optional lifecycle hook (on_show / on_hide)."""
+    callback = getattr(page, hook, None)
+    if callback is not None:
+        callback()
 
 if __name__ == "__main__":
-    app = App()
+    with tracer.span("App()", "page"):
+        app = App()
     app.mainloop()
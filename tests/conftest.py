@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# Run from anywhere: the feature folders are imported from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Login import database, hashing
+
+
+@pytest.fixture
+def scratch_db(tmp_path, monkeypatch):
+    """Points Login.database at an empty database file for the test."""
+    monkeypatch.setattr(database, "DATABASE_NAME", str(tmp_path / "test.db"))
+    database.initialise_database()
+    yield database.DATABASE_NAME
+    database.close_connection()
+
+
+@pytest.fixture
+def fast_hashing(monkeypatch):
+    """Hashes at a tiny scrypt cost instead of calibrating, so tests that create users are quick."""
+    params = hashing.HashParams("scrypt", 4)
+    monkeypatch.setattr(hashing, "_params", params)
+    return params
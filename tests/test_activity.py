@@ -0,0 +1,64 @@
+import time
+
+from WorkTimer.activity import ActivityRecorder
+
+T0 = 1_700_000_000 - 1_700_000_000 % 3600  # on an hour boundary
+
+
+def minute(recorder, t):
+    return recorder.tiers["minutes"].get(t // 60)
+
+
+def test_second_recorded_again_after_restart_is_not_double_counted(tmp_path):
+    first = ActivityRecorder(folder=str(tmp_path))
+    first.record(True, True, 2, 100, now=T0)
+    first.close()
+
+    second = ActivityRecorder(folder=str(tmp_path))
+    second.record(True, False, 0, 99, now=T0)  # same second, new state
+    assert minute(second, T0)["samples"] == 1
+    assert minute(second, T0)["working"] == 0
+    assert second.tiers["hours"].get(T0 // 3600)["samples"] == 1
+    second.record(True, False, 0, 98, now=T0 + 1)
+    assert minute(second, T0)["samples"] == 2
+    second.close()
+
+
+def test_same_second_change_replaces_the_sample():
+    recorder = ActivityRecorder(folder=None)
+    recorder.record(False, True, 0, 3000, now=T0)
+    recorder.record(True, True, 0, 3000, now=T0)
+    assert minute(recorder, T0)["samples"] == 1
+    assert minute(recorder, T0)["running"] == 1
+
+
+def test_bulk_gap_fill_matches_second_by_second_writes():
+    filled, stepped = ActivityRecorder(folder=None), ActivityRecorder(folder=None)
+    filled.record(True, True, 3, 500, now=T0 + 30)
+    filled.record(False, False, 0, 300, now=T0 + 30 + 4000)
+    for i in range(4000):
+        stepped.record(True, True, 3, max(0, 500 - i), now=T0 + 30 + i)
+    stepped.record(False, False, 0, 300, now=T0 + 30 + 4000)
+
+    for tier, count in (("seconds", 4100), ("minutes", 80), ("hours", 3)):
+        assert filled.series(tier, count, now=T0 + 4100) == stepped.series(tier, count, now=T0 + 4100), tier
+    remaining = [v[3] for _, v in filled.series("seconds", 4001, now=T0 + 4030)[:-1]]
+    assert remaining[:3] == [500, 499, 498] and remaining[-1] == 0  # counts down, stops at zero
+
+
+def test_gap_fill_wraps_around_the_seconds_ring():
+    recorder = ActivityRecorder(folder=None)
+    start = T0 - T0 % 86400 + 86400 - 100  # 100 s before the ring wraps
+    recorder.record(True, False, 0, 250, now=start)
+    recorder.record(True, False, 0, 50, now=start + 200)
+    values = [v for _, v in recorder.series("seconds", 201, now=start + 200)]
+    assert [v[3] for v in values] == list(range(250, 50, -1)) + [50]
+
+
+def test_six_hour_gap_fills_quickly():
+    recorder = ActivityRecorder(folder=None)
+    recorder.record(True, True, 1, 3000, now=T0)
+    began = time.perf_counter()
+    recorder.record(True, True, 1, 3000, now=T0 + 6 * 3600)
+    assert time.perf_counter() - began < 0.05
+    assert recorder.tiers["hours"].get(T0 // 3600 + 3)["samples"] == 3600
@@ -0,0 +1,30 @@
+from Login import bulk, database, hashing
+
+
+def test_bad_rows_are_reported_not_raised(scratch_db, fast_hashing):
+    good_hash = hashing.hash_password("Exported1", fast_hashing)
+    rows = [
+        {"username": "ok", "password": "Password1", "walk_streak": "3"},
+        {"username": "int_password", "password": 12345678},
+        {"username": "weak", "password": "password"},
+        {"username": "bad_streak", "password": "Password1", "walk_streak": "lots"},
+        {"username": "float_streak", "password": "Password1", "work_streak": 1.5},
+        {"username": "bad_hash", "password_hash": "not-a-hash"},
+        {"username": "fake_bcrypt", "password_hash": "$2b$12$short"},
+        {"username": 42, "password": "Password1"},
+        None,  # an unreadable JSONL line
+        {"username": "exported", "password_hash": good_hash, "work_streak": 7},
+    ]
+    report = bulk.import_users(rows, workers=1)
+
+    assert report.inserted == 2
+    assert report.invalid == [2, 3, 4, 5, 6, 7, 8, 9]
+    assert database.get_user("ok")[3] == 3
+    assert database.verify_user("exported", "Exported1")
+    assert database.get_user("int_password") is None
+
+
+def test_unreadable_jsonl_line_becomes_none(tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text('{"username": "a", "password": "Password1"}\n{not json\n', encoding="utf-8")
+    assert list(bulk.read_users(str(path))) == [{"username": "a", "password": "Password1"}, None]
@@ -0,0 +1,26 @@
+import pytest
+
+from WorkTimer.countdown import Countdown, format_remaining, simulate_day
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_eight_hour_day_ends_within_one_tick(seed):
+    error, legacy_drift = simulate_day(hours=8, seed=seed)
+    assert 0 <= error < 1.0  # one tick is one second
+    assert legacy_drift > 1.0  # the old subtract-the-delta loop is off by much more
+
+
+def test_heavy_jitter_and_stalls_still_within_one_tick():
+    error, _ = simulate_day(hours=8, jitter_ms=200, stall_every=100, stall_ms=3000, seed=7)
+    assert 0 <= error < 1.0
+
+
+def test_pause_keeps_remaining_time():
+    now = [0.0]
+    countdown = Countdown(60, clock=lambda: now[0], wall_clock=lambda: now[0])
+    countdown.start()
+    now[0] += 10
+    countdown.pause()
+    now[0] += 1000
+    assert countdown.remaining() == 50
+    assert format_remaining(countdown.remaining()) == "00:50"
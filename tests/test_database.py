@@ -0,0 +1,41 @@
+import sqlite3
+
+from Login import database
+
+
+def make_legacy(path, usernames):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE users (userID INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL UNIQUE, "
+                 "password_hash TEXT NOT NULL, walk_streak INTEGER DEFAULT 0, work_streak INTEGER DEFAULT 0)")
+    conn.executemany("INSERT INTO users (username, password_hash, work_streak) VALUES (?, '-', 3)",
+                     [(name,) for name in usernames])
+    conn.commit()
+    conn.close()
+
+
+def test_accounts_in_an_old_database_are_migrated(tmp_path, monkeypatch):
+    empty, old = tmp_path / "empty.db", tmp_path / "old.db"
+    make_legacy(empty, [])
+    make_legacy(old, ["alice", "bob"])
+    new = tmp_path / "home" / "user.db"
+    new.parent.mkdir()
+    monkeypatch.setattr(database, "USER_DATABASE_NAME", str(new))
+    monkeypatch.setattr(database, "DATABASE_NAME", str(new))
+    monkeypatch.setattr(database, "LEGACY_DATABASE_NAMES", (str(tmp_path / "missing.db"), str(empty), str(old)))
+
+    try:
+        database.initialise_database()  # opens the per-user database -> migrates first
+        assert database.get_user("alice")[4] == 3
+        assert database.get_user("bob") is not None
+    finally:
+        database.close_connection()
+
+
+def test_existing_user_database_is_left_alone(tmp_path):
+    old, new = tmp_path / "old.db", tmp_path / "new.db"
+    make_legacy(old, ["alice"])
+    make_legacy(new, [])
+    assert database.migrate_legacy_database(str(new), (str(old),)) is None
+    conn = sqlite3.connect(new)
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 0
+    conn.close()
@@ -0,0 +1,27 @@
+import time
+
+from WorkTimer.engine import PomodoroEngine, VirtualClock, simulate_year
+
+
+def test_simulated_year_has_the_analytic_number_of_work_periods():
+    start = time.perf_counter()
+    work_periods, posture_changes, wakeups = simulate_year()
+    took = time.perf_counter() - start
+
+    cycles = 365 * 8 * 3600 // (55 * 60)  # 50 min work + 5 min break, paused overnight
+    assert cycles == 3185
+    assert work_periods == cycles
+    assert posture_changes > 0
+    assert took < 1.0
+
+
+def test_session_end_reports_completed_period():
+    clock = VirtualClock(1000.0)
+    engine = PomodoroEngine(work_seconds=60, break_seconds=30, clock=clock, wall_clock=clock)
+    sessions = []
+    engine.on_session_end = sessions.append
+    engine.start()
+    clock.sleep(61)
+    engine.advance()
+    assert [(s.mode, s.started_at, s.ended_at, s.completed) for s in sessions] == [("work", 1000.0, 1060.0, True)]
+    assert not engine.is_working and engine.time_remaining == 29
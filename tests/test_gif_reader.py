@@ -0,0 +1,92 @@
+import os
+import random
+import struct
+
+import pytest
+
+from Profile import gif_reader
+from Profile.gif_reader import GifError, parse_gif
+
+PICTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pictures")
+
+
+def make_gif(frames, loop_count=None, size=(4, 4)):
+    """A small GIF89a: a 2-colour global table, optional NETSCAPE loop block, and one
+    image per (delay_cs, disposal, transparent_index) with a GCE in front of it."""
+    out = b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0x80, 0, 0) + b"\x00\x00\x00\xff\xff\xff"
+    if loop_count is not None:
+        out += b"\x21\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop_count) + b"\x00"
+    for i, (delay_cs, disposal, transparent) in enumerate(frames):
+        flags = (disposal << 2) | (1 if transparent is not None else 0)
+        out += b"\x21\xf9\x04" + struct.pack("<BHB", flags, delay_cs, transparent or 0) + b"\x00"
+        out += b"\x2c" + struct.pack("<HHHHB", i, 0, 1, 1, 0)
+        out += b"\x02\x02\x44\x01\x00"  # LZW: min code size 2, one 2-byte sub-block, terminator
+    return out + b"\x3b"
+
+
+def test_frames_delays_disposal_and_loop():
+    data = make_gif([(5, gif_reader.DISPOSE_KEEP, None),
+                     (1, gif_reader.DISPOSE_BACKGROUND, 1),
+                     (0, gif_reader.DISPOSE_PREVIOUS, None)], loop_count=0)
+    info = parse_gif(data)
+    assert (info.width, info.height, info.loop_count) == (4, 4, 0)
+    assert len(info.frames) == 3
+    # 1 cs is below MIN_DELAY_MS and 0 means "unset": both play at the default
+    assert [f.delay_ms for f in info.frames] == [50, gif_reader.DEFAULT_DELAY_MS, gif_reader.DEFAULT_DELAY_MS]
+    assert [f.disposal for f in info.frames] == [1, 2, 3]
+    assert [f.transparent_index for f in info.frames] == [None, 1, None]
+    assert [f.left for f in info.frames] == [0, 1, 2]
+    for frame in info.frames:
+        assert frame.data.startswith(b"GIF89a") and frame.data.endswith(b"\x3b")
+        assert parse_gif(frame.data).frames[0].transparent_index == frame.transparent_index
+
+
+def test_gce_applies_to_the_next_frame_only():
+    data = make_gif([(7, gif_reader.DISPOSE_BACKGROUND, 0)])
+    # A second image without its own GCE
+    data = data[:-1] + b"\x2c" + struct.pack("<HHHHB", 0, 0, 1, 1, 0) + b"\x02\x02\x44\x01\x00\x3b"
+    first, second = parse_gif(data).frames
+    assert (first.delay_ms, first.disposal, first.transparent_index) == (70, 2, 0)
+    assert (second.delay_ms, second.disposal, second.transparent_index) == (gif_reader.DEFAULT_DELAY_MS, 0, None)
+
+
+def test_no_loop_block_plays_once():
+    assert parse_gif(make_gif([(10, 0, None)])).loop_count is None
+
+
+@pytest.mark.parametrize("data", [b"", b"PNG\x89", b"GIF89a", b"GIF89a\x04\x00"])
+def test_not_a_gif(data):
+    with pytest.raises(GifError):
+        parse_gif(data)
+
+
+def test_every_truncation_raises_gif_error_or_keeps_whole_frames():
+    data = make_gif([(5, 1, None), (5, 2, 1), (5, 3, None)], loop_count=2)
+    for cut in range(len(data)):
+        try:
+            info = parse_gif(data[:cut])
+        except GifError:
+            continue
+        assert len(info.frames) <= 3  # cut after a complete frame: what's there is usable
+
+
+def test_real_gif_truncated_and_corrupted():
+    with open(os.path.join(PICTURES, "drink_water.gif"), "rb") as f:
+        data = f.read()
+    assert len(parse_gif(data).frames) > 1
+    rng = random.Random(11)
+    cuts = list(range(0, 2048)) + [rng.randrange(len(data)) for _ in range(300)]
+    for cut in cuts:
+        try:
+            parse_gif(data[:cut])
+        except GifError:
+            pass
+    for _ in range(300):
+        broken = bytearray(data[:rng.randrange(len(data))])
+        for _ in range(4):
+            if broken:
+                broken[rng.randrange(len(broken))] = rng.randrange(256)
+        try:
+            parse_gif(bytes(broken))
+        except GifError:
+            pass
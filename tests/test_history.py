@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from Login import database, history
+from WorkTimer.engine import PomodoroEngine, VirtualClock
+
+
+def work_streak(username):
+    return database.get_connection().execute(
+        "SELECT work_streak FROM users WHERE username = ?", (username,)).fetchone()[0]
+
+
+def test_finished_work_period_increments_users_work_streak(scratch_db, fast_hashing):
+    database.add_user("alice", "Password1")
+
+    monday_9am = datetime(2026, 3, 2, 9).timestamp()
+    clock = VirtualClock(monday_9am)
+    engine = PomodoroEngine(work_seconds=50 * 60, break_seconds=5 * 60, clock=clock, wall_clock=clock)
+    engine.on_session_end = lambda session: history.record_session("alice", *session)
+    engine.start()
+    clock.sleep(50 * 60 + 1)
+    engine.advance()  # the work period ends -> one completed work session
+    assert work_streak("alice") == 1
+
+    clock.sleep(24 * 3600)  # the next day
+    engine.advance()
+    assert work_streak("alice") == 2
+    assert history.current_streak("alice", (datetime.fromtimestamp(clock.now)).date()) == 2
+
+
+def test_reset_work_period_does_not_count(scratch_db, fast_hashing):
+    database.add_user("bob", "Password1")
+    clock = VirtualClock(datetime(2026, 3, 2, 9).timestamp())
+    engine = PomodoroEngine(clock=clock, wall_clock=clock)
+    engine.on_session_end = lambda session: history.record_session("bob", *session)
+    engine.start()
+    clock.sleep(10 * 60)
+    engine.reset()
+    assert work_streak("bob") == 0
+    stats = history.day_stats("bob", datetime.fromtimestamp(clock.now).date())
+    assert (stats.sessions, stats.completed_work, stats.work_seconds) == (1, 0, 600)
+
+
+def test_missed_day_restarts_the_streak(scratch_db, fast_hashing):
+    database.add_user("carol", "Password1")
+    noon = datetime(2026, 3, 2, 12)
+    for day in (0, 1, 3):
+        t = (noon + timedelta(days=day)).timestamp()
+        history.record_session("carol", "work", t, t + 3000, 3000, 3000, True)
+    assert work_streak("carol") == 1
+
+
+def test_lapsed_work_streak_is_reset_without_a_new_session(scratch_db, fast_hashing):
+    database.add_user("dave", "Password1")
+    database.add_user("erin", "Password1")
+    database.get_connection().execute("UPDATE users SET work_streak = 7 WHERE username = 'erin'")  # imported
+    noon = datetime(2026, 3, 2, 12)
+    for day in (0, 1):
+        t = (noon + timedelta(days=day)).timestamp()
+        history.record_session("dave", "work", t, t + 3000, 3000, 3000, True)
+    assert work_streak("dave") == 2
+
+    # The day after the last session the streak can still be continued
+    assert history.expire_streaks(today=noon.date() + timedelta(days=2)) == 0
+    assert work_streak("dave") == 2
+
+    # A whole day missed: reset, even though nothing new was recorded
+    assert history.expire_streaks(today=noon.date() + timedelta(days=3)) == 1
+    assert work_streak("dave") == 0
+    assert work_streak("erin") == 7  # no history to judge by
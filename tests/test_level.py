@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from Profile import profile
+
+
+def level_info_loop(xp):
+    """The original level_info: walk up one level at a time. The reference for the closed form."""
+    lvl = 1
+    rem = xp
+    need = profile.BASE_LEVEL_XP * lvl
+    while rem >= need:
+        rem -= need
+        lvl += 1
+        need = profile.BASE_LEVEL_XP * lvl
+    return lvl, rem, need, (need - rem)
+
+
+def test_exhaustive_small_range():
+    for xp in range(-1000, 100_000):
+        assert profile.level_info(xp) == level_info_loop(xp), xp
+
+
+def test_level_boundaries():
+    threshold = 0
+    for lvl in range(1, 300):
+        threshold += profile.BASE_LEVEL_XP * lvl  # total XP to reach lvl + 1
+        for xp in (threshold - 1, threshold, threshold + 1):
+            assert profile.level_info(xp) == level_info_loop(xp), xp
+
+
+def test_random_large_xp():
+    rng = random.Random(8)
+    for _ in range(100):
+        xp = rng.randrange(10 ** 12)
+        assert profile.level_info(xp) == level_info_loop(xp), xp
+
+
+def test_random_float_xp():
+    rng = random.Random(80)
+    for _ in range(2000):
+        xp = rng.uniform(-100, 10 ** 7)
+        assert profile.level_info(xp) == level_info_loop(xp), xp
+    for xp in (0.0, 499.999, 500.0, 1499.5, 1500.0):
+        assert profile.level_info(xp) == level_info_loop(xp), xp
+
+
+def test_negative_xp_is_level_one():
+    for xp in (-1, -499, -500, -10 ** 9):
+        assert profile.level_info(xp) == level_info_loop(xp) == (1, xp, profile.BASE_LEVEL_XP,
+                                                                    profile.BASE_LEVEL_XP - xp)
+
+
+@pytest.mark.parametrize("base", [1, 7, 1000])
+def test_other_base_level_xp(monkeypatch, base):
+    monkeypatch.setattr(profile, "BASE_LEVEL_XP", base)
+    rng = random.Random(base)
+    values = list(range(-50, 20_000)) + [rng.randrange(10 ** 9) for _ in range(200)]
+    for xp in values:
+        assert profile.level_info(xp) == level_info_loop(xp), (base, xp)
+    assert profile.level_info_batch(values) == [level_info_loop(xp) for xp in values]
+
+
+def test_batch_matches_single():
+    rng = random.Random(88)
+    values = (list(range(-600, 30_000, 7)) + [rng.randrange(10 ** 12) for _ in range(100)]
+              + [rng.uniform(0, 10 ** 6) for _ in range(500)])
+    assert profile.level_info_batch(values) == [level_info_loop(xp) for xp in values]
+    assert profile.level_info_batch(iter(values[:10])) == [profile.level_info(xp) for xp in values[:10]]
+    assert profile.level_info_batch([]) == []
@@ -0,0 +1,69 @@
+import time
+import types
+
+import pytest
+
+from Login import database, hashing, services, sessions
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(services, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_throttled_attempt_is_rejected_before_any_hashing(scratch_db, fast_hashing, fake_time, monkeypatch):
+    monkeypatch.setattr(services, "login_throttle", services.LoginThrottle(max_failures=3, window=60))
+    database.add_user("alice", "Password1")
+    for _ in range(3):
+        assert not services.verify_user("alice", "wrong")
+
+    checked = []
+    monkeypatch.setattr(hashing, "check_password", lambda *args: checked.append(args) or True)
+    assert not services.verify_user("alice", "Password1")
+    assert checked == []
+    assert services.login_retry_after("alice") == 60
+
+
+def test_window_slides(fake_time):
+    throttle = services.LoginThrottle(max_failures=3, window=60)
+    for _ in range(3):
+        throttle.record_failure("bob")
+        fake_time[0] += 10
+    assert throttle.retry_after("bob") == 30  # the oldest failure leaves the window in 30 s
+
+    fake_time[0] += 30
+    assert throttle.retry_after("bob") == 0
+    throttle.record_failure("bob")  # only the two newer failures are still in the window
+    assert throttle.retry_after("bob") == 10
+    fake_time[0] += 10
+    assert throttle.retry_after("bob") == 0
+
+
+def test_lru_eviction_caps_entries(fake_time):
+    throttle = services.LoginThrottle(max_failures=2, max_entries=3)
+    for name in ("a", "b", "c"):
+        throttle.record_failure(name)
+    throttle.retry_after("a")  # touch "a" so "b" is now the least recently used
+    throttle.record_failure("d")
+    assert list(throttle._failures) == ["c", "a", "d"]
+    for i in range(100):
+        throttle.record_failure(f"spray{i}")
+    assert len(throttle._failures) == 3
+
+
+def test_prune_drops_stale_failures_of_every_username(scratch_db):
+    throttle = services.LoginThrottle(window=60, persist=True)
+    now = time.time()
+    with database.transaction() as conn:
+        conn.executemany("INSERT INTO login_failures (username, failed_at) VALUES (?, ?)",
+                         [("sprayed1", now - 3600), ("sprayed2", now - 120), ("recent", now - 5)])
+
+    assert throttle.prune() == 2
+    rows = database.get_connection().execute("SELECT username FROM login_failures").fetchall()
+    assert rows == [("recent",)]
+
+
+def test_cleanup_thread_runs_the_throttle_prune():
+    assert services.prune_login_failures in sessions.cleanup_tasks
@@ -0,0 +1,89 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from Profile import profile
+from Profile.profile import ProfileStore, UserProfile
+
+
+@pytest.fixture
+def profile_path(tmp_path, monkeypatch):
+    path = tmp_path / "profile.json"
+    monkeypatch.setattr(profile, "PROFILE_PATH", str(path))
+    return path
+
+
+def wait_for(condition, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_rapid_saves_coalesce_into_one_write(profile_path):
+    store = ProfileStore(delay=0.05, max_delay=5.0, fsync="none")
+    for xp in range(100):
+        store.save(UserProfile(xp=xp))
+    assert store.writes == 0 and store.pending()["xp"] == 99
+
+    assert wait_for(lambda: store.writes == 1)
+    time.sleep(0.1)
+    assert store.writes == 1
+    assert json.loads(profile_path.read_text())["xp"] == 99
+
+
+def test_max_delay_bounds_a_stream_of_saves(profile_path):
+    store = ProfileStore(delay=0.05, max_delay=0.2, fsync="none")
+    end = time.monotonic() + 0.5
+    xp = 0
+    while time.monotonic() < end:  # never quiet for `delay`
+        store.save(UserProfile(xp=xp))
+        xp += 1
+        time.sleep(0.01)
+    assert store.writes >= 1
+    store.flush()
+    assert json.loads(profile_path.read_text())["xp"] == xp - 1
+
+
+def test_save_does_not_wait_for_a_write_in_progress(profile_path, monkeypatch):
+    store = ProfileStore(delay=0.0, fsync="none")
+    writing, release = threading.Event(), threading.Event()
+    real_write = profile._atomic_write_json
+
+    def slow_write(path, data, fsync):
+        writing.set()
+        release.wait(2)
+        real_write(path, data, fsync)
+
+    monkeypatch.setattr(profile, "_atomic_write_json", slow_write)
+    store.save(UserProfile(xp=1))
+    assert writing.wait(2)  # the writer thread is now stuck "on disk"
+
+    began = time.perf_counter()
+    store.save(UserProfile(xp=2))
+    assert time.perf_counter() - began < 0.05
+    release.set()
+    assert wait_for(lambda: store.writes == 2)
+    assert json.loads(profile_path.read_text())["xp"] == 2
+
+
+def test_failed_write_leaves_the_old_file_whole(profile_path, monkeypatch):
+    store = ProfileStore(delay=10, fsync="file")
+    store.save(UserProfile(xp=1))
+    store.flush()
+    before = profile_path.read_text()
+
+    def broken_dump(data, f, **kwargs):
+        f.write('{"display_name": "half a')
+        raise OSError("disk full")
+
+    monkeypatch.setattr(profile.json, "dump", broken_dump)
+    store.save(UserProfile(xp=2))
+    store.flush()
+
+    assert profile_path.read_text() == before
+    assert os.listdir(profile_path.parent) == ["profile.json"]  # no temp file left behind
+    assert store.pending()["xp"] == 2  # kept for the next attempt
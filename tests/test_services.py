@@ -0,0 +1,24 @@
+from Login import database, history, services, sessions
+
+
+def test_start_up_creates_tables_then_resumes_a_saved_session(tmp_path, monkeypatch, fast_hashing):
+    monkeypatch.setattr(database, "DATABASE_NAME", str(tmp_path / "fresh.db"))
+    monkeypatch.setattr(sessions, "TOKEN_PATH", str(tmp_path / "session"))
+    monkeypatch.setattr(sessions, "start_cleanup", lambda: None)
+    try:
+        assert services.start_up() is None  # nothing remembered yet
+        assert database.DATABASE_NAME in history._initialised
+
+        database.add_user("alice", "Password1")
+        services.remember_login("alice")
+        assert services.start_up() == "alice"
+
+        sessions.revoke_session(sessions.load_token())
+        assert services.start_up() is None
+        assert sessions.load_token() is None  # a stale token is forgotten
+    finally:
+        database.close_connection()
+
+
+def test_lapsed_streaks_are_expired_by_the_cleanup_thread():
+    assert history.expire_streaks in sessions.cleanup_tasks
@@ -0,0 +1,77 @@
+import os
+import time
+
+import pytest
+
+from Profile.thumbnails import ThumbnailCache
+
+PICTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pictures")
+
+
+class FakeRoot:
+    def __init__(self):
+        self.queue = []
+
+    def _root(self):
+        return self
+
+    def after(self, ms, fn, *args):
+        self.queue.append((fn, args))
+
+    def winfo_exists(self):
+        return True
+
+    def run(self, timeout=2.0):
+        end = time.monotonic() + timeout
+        while self.queue and time.monotonic() < end:
+            fn, args = self.queue.pop(0)
+            fn(*args)
+            time.sleep(0.001)
+
+
+class FakeWindow:
+    """A Toplevel that can be closed; Tk drops the after() callbacks of a destroyed widget."""
+
+    def __init__(self, root):
+        self.root, self.alive = root, True
+
+    def _root(self):
+        return self.root
+
+    def after(self, ms, fn, *args):
+        if self.alive:
+            self.root.after(ms, fn, *args)
+
+    def winfo_exists(self):
+        return self.alive
+
+
+def test_closing_the_requesting_window_does_not_strand_later_waiters(tmp_path):
+    picture = tmp_path / "avatar.png"
+    picture.write_bytes(b"not really a png")
+    cache = ThumbnailCache(folder=str(tmp_path / "thumbs"))
+    cache._prepare = lambda path: (time.sleep(0.05), ("digest", []))[1]
+
+    root = FakeRoot()
+    profile_window, panel = FakeWindow(root), FakeWindow(root)
+    calls = []
+    cache.ensure(profile_window, str(picture), lambda: calls.append("window"))
+    profile_window.alive = False  # closed before the worker finished
+    cache.ensure(panel, str(picture), lambda: calls.append("panel"))
+    root.run()
+
+    assert calls == ["panel"]
+    assert not cache._pending
+
+
+def test_pillow_resamples_off_the_tk_thread(tmp_path):
+    pytest.importorskip("PIL")
+    from PIL import Image
+
+    cache = ThumbnailCache(folder=str(tmp_path / "thumbs"))
+    source = os.path.join(PICTURES, "front_avatar.png")
+    digest, missing = cache._prepare(source)  # what the worker thread runs
+    assert missing == []  # nothing left for the Tk fallback
+    for size in cache.sizes:
+        with Image.open(cache.thumb_path(digest, size)) as thumb:
+            assert max(thumb.size) == size